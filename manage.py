@@ -1,5 +1,7 @@
+import asyncio
 import os
 import subprocess
+import time
 
 import uvicorn
 from typer import Typer
@@ -14,7 +16,7 @@ def run_api_server(mode: str = "development"):
     if mode == "development":
         subprocess.Popen("wsl redis-server", shell=True)
 
-    uvicorn.run("server.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("server.main:create_app", factory=True, host="0.0.0.0", port=8000, reload=True)
 
 
 @app.command(name="run-containers")
@@ -43,5 +45,199 @@ def rebuild_api_image():
     subprocess.run('docker image prune --force --filter "dangling=true"', shell=True)
 
 
+@app.command(name="generate-jwt-key")
+def generate_jwt_key(kid: str, directory: str = "configurations/keys", algorithm: str = "RS256"):
+    from pathlib import Path
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    curves = {"ES256": ec.SECP256R1(), "ES384": ec.SECP384R1(), "ES512": ec.SECP521R1()}
+    if algorithm in curves:
+        private_key = ec.generate_private_key(curves[algorithm])
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    path = Path(directory) / f"{kid}.pem"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    print(f"Key {kid} written to {path}. It signs new tokens unless JWT_ACTIVE_KID names another key.")
+
+
+@app.command(name="create-tables")
+def create_tables():
+    from server.database.managers import create_db_and_tables, dispose_database_engine
+
+    async def run():
+        try:
+            await create_db_and_tables()
+        finally:
+            await dispose_database_engine()
+
+    asyncio.run(run())
+    print("Relational database tables created!")
+
+
+@app.command(name="migrate-product-shops")
+def migrate_product_shops():
+    from server.database.managers import pool_database_clients
+    from server.database.products.crud import migrate_embedded_shops
+
+    async def run() -> int:
+        await pool_database_clients()
+        return await migrate_embedded_shops()
+
+    print(f"Rewrote {asyncio.run(run())} products to reference their shop.")
+
+
+@app.command(name="benchmark-password-hashing")
+def benchmark_password_hashing(logins: int = 20, probes: int = 200):
+    from server.security.authentication import PasswordContext
+
+    async def simulate_login(context: PasswordContext, hashed_password: str, offload: bool):
+        if offload:
+            await context.verify_password_async("Admin@12345", hashed_password)
+        else:
+            context.verify_password("Admin@12345", hashed_password)
+
+    async def simulate_product_reads(latencies: list):
+        for _ in range(probes):
+            started_at = time.perf_counter()
+            await asyncio.sleep(0.001)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    async def run(offload: bool) -> list:
+        context = PasswordContext()
+        hashed_password = context.hash_plain_password("Admin@12345")
+        latencies = []
+        await asyncio.gather(
+            simulate_product_reads(latencies),
+            *[simulate_login(context, hashed_password, offload) for _ in range(logins)],
+        )
+        context.shutdown()
+        return sorted(latencies)
+
+    for label, offload in (("inline", False), ("offloaded", True)):
+        latencies = asyncio.run(run(offload))
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"{label:>10}: p50={p50:.2f}ms p99={p99:.2f}ms max={latencies[-1]:.2f}ms")
+
+
+@app.command(name="run-mail-worker")
+def run_mail_worker(consumer: str = "mailer-1"):
+    from server.database.managers import close_redis_client, ping_redis_server
+    from server.workers.mail import MailWorker
+
+    async def run():
+        await ping_redis_server()
+        try:
+            await MailWorker(consumer=consumer).run()
+        finally:
+            await close_redis_client()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print(f"Mail worker {consumer} stopped!")
+
+
+@app.command(name="benchmark-serialization")
+def benchmark_serialization(products: int = 1000, rounds: int = 20):
+    from typing import List
+
+    from beanie import PydanticObjectId
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    from server.database.managers import pool_database_clients
+    from server.models.documents.products import ProductDocument
+    from server.schemas.out.products import ProductResponse
+    from server.utils.responses import ORJSONResponse, model_response
+
+    async def run():
+        await pool_database_clients()
+        shop = {"id": PydanticObjectId(), "name": "Benchmark shop"}
+        documents = [
+            ProductDocument(
+                id=PydanticObjectId(),
+                name=f"Product {index}",
+                brand="Brand",
+                model=f"M-{index}",
+                description="A product used for serialization benchmarks.",
+                price=index + 0.99,
+                available_sizes=["S", "M", "L"],
+                colors=["black", "white"],
+                rating=4.5,
+                shop=shop,
+            )
+            for index in range(products)
+        ]
+        field = create_response_field(name="products", type_=List[ProductResponse])
+
+        async def validated(response_class):
+            return response_class(await serialize_response(field=field, response_content=documents))
+
+        async def direct(_):
+            return model_response(documents, ProductResponse)
+
+        for label, render, response_class in (
+            ("pydantic + json", validated, JSONResponse),
+            ("pydantic + orjson", validated, ORJSONResponse),
+            ("direct + orjson", direct, None),
+        ):
+            started_at = time.perf_counter()
+            for _ in range(rounds):
+                body = (await render(response_class)).body
+            elapsed = (time.perf_counter() - started_at) * 1000 / rounds
+            print(f"{label:>18}: {elapsed:.2f}ms per {products} products ({len(body)} bytes)")
+
+    asyncio.run(run())
+
+
+@app.command(name="profile-imports")
+def profile_imports(module: str = "server.main", top: int = 15, budget_ms: float = 0):
+    import sys
+    from collections import defaultdict
+
+    script = (
+        f"import resource, {module}; "
+        f"getattr({module}, 'create_app', lambda: None)(); "
+        "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit(result.returncode)
+
+    packages = defaultdict(int)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:") :].split("|")
+        packages[name.strip().split(".")[0]] += int(own)
+        total += int(own)
+
+    print(f"Imported {module} in {total / 1000:.0f}ms using {int(result.stdout.split()[-1]) / 1024:.0f}MB max RSS")
+    for name, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{own / 1000:>8.1f}ms  {name}")
+
+    if budget_ms and total / 1000 > budget_ms:
+        print(f"Import time exceeds the {budget_ms:.0f}ms budget!")
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
     app()
@@ -13,12 +13,25 @@ class RootConfig(BaseSettings):
 class BaseConfig(RootConfig):
     APP_NAME: str
 
+    # Startup Configurations
+    STARTUP_CREATE_TABLES: bool = Field(default=True)
+    STARTUP_TIMEOUT: float = Field(default=30.0)
+
+    # Pagination Configurations
+    PAGINATION_DEFAULT_LIMIT: int = Field(default=10)
+    PAGINATION_MAX_LIMIT: int = Field(default=100)
+
     # SQL Database Configurations
     POSTGRES_HOST: Union[str, None] = Field(default=None)
     POSTGRES_PORT: Union[str, None] = Field(default=None)
     POSTGRES_USER: Union[str, None] = Field(default=None)
     POSTGRES_PASSWORD: Union[str, None] = Field(default=None)
     POSTGRES_DB: Union[str, None] = Field(default=None)
+    POSTGRES_POOL_SIZE: int = Field(default=5)
+    POSTGRES_MAX_OVERFLOW: int = Field(default=10)
+    POSTGRES_POOL_PRE_PING: bool = Field(default=True)
+    POSTGRES_POOL_RECYCLE: int = Field(default=1800)
+    POSTGRES_STATEMENT_CACHE_SIZE: int = Field(default=100)
 
     # MongoDB Configurations
     MONGO_URI: str
@@ -26,6 +39,26 @@ class BaseConfig(RootConfig):
     # Cache Servers Configurations
     REDIS_HOST: str
     REDIS_PORT: int
+    REDIS_MAX_CONNECTIONS: int = Field(default=50)
+
+    # Product Cache Configurations
+    PRODUCT_CACHE_TTL: int = Field(default=300)
+    PRODUCT_CACHE_LOCAL_TTL: float = Field(default=5.0)
+    PRODUCT_CACHE_LOCAL_SIZE: int = Field(default=1024)
+
+    # Product Import Configurations
+    PRODUCT_IMPORT_BATCH_SIZE: int = Field(default=1000)
+    PRODUCT_IMPORT_MAX_LINE_SIZE: int = Field(default=65536)
+
+    # Product Search Configurations
+    PRODUCT_SEARCH_PRICE_BUCKETS: int = Field(default=5)
+
+    # Autocomplete Configurations
+    AUTOCOMPLETE_MAX_ENTRIES: int = Field(default=100000)
+    AUTOCOMPLETE_MAX_PREFIX_LENGTH: int = Field(default=20)
+    AUTOCOMPLETE_TOP_K: int = Field(default=10)
+    AUTOCOMPLETE_REFRESH_INTERVAL: float = Field(default=300.0)
+    AUTOCOMPLETE_LOAD_BATCH_SIZE: int = Field(default=1000)
 
     # JWT Configurations
     JWT_SECRET_KEY: str
@@ -34,6 +67,31 @@ class BaseConfig(RootConfig):
     JWT_MIN: int
     JWT_HOUR: int
     JWT_DAY: int
+    JWT_KEYS_DIRECTORY: Union[str, None] = Field(default=None)
+    JWT_ACTIVE_KID: Union[str, None] = Field(default=None)
+    JWT_LOCAL_VERIFICATION: bool = Field(default=True)
+    JWT_CLAIMS_CACHE_SIZE: int = Field(default=10000)
+    SESSION_DENYLIST_SYNC_INTERVAL: float = Field(default=5.0)
+
+    # One-Time Token Configurations
+    ACTIVATION_TOKEN_TTL: int = Field(default=24 * 60 * 60)
+    PASSWORD_RESET_TOKEN_TTL: int = Field(default=15 * 60)
+    EMAIL_CHANGE_TOKEN_TTL: int = Field(default=15 * 60)
+
+    # Rate Limit Configurations
+    RATE_LIMIT_ENABLED: bool = Field(default=True)
+    RATE_LIMIT_LOCAL_SIZE: int = Field(default=10000)
+    LOGIN_RATE_LIMIT: int = Field(default=10)
+    LOGIN_RATE_LIMIT_WINDOW: int = Field(default=60)
+    SIGNUP_RATE_LIMIT: int = Field(default=5)
+    SIGNUP_RATE_LIMIT_WINDOW: int = Field(default=60 * 60)
+    MAIL_RATE_LIMIT: int = Field(default=3)
+    MAIL_RATE_LIMIT_WINDOW: int = Field(default=15 * 60)
+
+    # Password Hashing Configurations
+    PASSWORD_HASHING_EXECUTOR: str = Field(default="thread")
+    PASSWORD_HASHING_WORKERS: int = Field(default=4)
+    PASSWORD_HASHING_CONCURRENCY: int = Field(default=4)
 
     # SMTP Configurations
     MAIL_USERNAME: Union[EmailStr, str]
@@ -45,6 +103,18 @@ class BaseConfig(RootConfig):
     MAIL_STARTTLS: bool
     MAIL_SSL_TLS: bool
     USE_CREDENTIALS: bool
+    MAIL_POOL_SIZE: int = Field(default=2)
+    MAIL_QUEUE_SIZE: int = Field(default=1000)
+    MAIL_BATCH_SIZE: int = Field(default=50)
+    MAIL_MAX_RETRIES: int = Field(default=3)
+    MAIL_RETRY_BACKOFF: float = Field(default=1.0)
+    MAIL_IDLE_TIMEOUT: float = Field(default=60.0)
+    MAIL_JOBS_ENABLED: bool = Field(default=True)
+    MAIL_JOB_STREAM: str = Field(default="mail-jobs")
+    MAIL_JOB_GROUP: str = Field(default="mailers")
+    MAIL_JOB_MAX_ATTEMPTS: int = Field(default=5)
+    MAIL_JOB_VISIBILITY_TIMEOUT: int = Field(default=60)
+    MAIL_JOB_STREAM_MAXLEN: int = Field(default=100000)
 
     class Config:
         env_file = "configurations/.env"
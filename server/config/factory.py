@@ -3,9 +3,6 @@ from functools import lru_cache
 from decouple import config
 
 from server.config.environments.base import BaseConfig
-from server.config.environments.development import DevelopmentConfig
-from server.config.environments.production import ProductionConfig
-from server.config.environments.staging import StagingConfig
 
 
 class SettingsFactory:
@@ -14,10 +11,16 @@ class SettingsFactory:
 
     def __call__(self) -> BaseConfig:
         if self.mode == "staging":  # pragma: no cover
+            from server.config.environments.staging import StagingConfig
+
             return StagingConfig()
         elif self.mode == "production":
+            from server.config.environments.production import ProductionConfig
+
             return ProductionConfig()
         else:  # pragma: no cover
+            from server.config.environments.development import DevelopmentConfig
+
             return DevelopmentConfig()
 
 
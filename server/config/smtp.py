@@ -1,6 +1,5 @@
 from functools import lru_cache
 
-from fastapi.templating import Jinja2Templates
 from fastapi_mail import ConnectionConfig
 
 from server.config.factory import settings
@@ -19,8 +18,3 @@ def config_smtp_server() -> ConnectionConfig:
         MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
         USE_CREDENTIALS=settings.USE_CREDENTIALS,
     )
-
-
-@lru_cache()
-def config_templates() -> Jinja2Templates:
-    return Jinja2Templates(directory="server/templates")
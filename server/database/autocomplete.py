@@ -0,0 +1,117 @@
+import asyncio
+from contextlib import suppress
+from typing import Dict, Iterable, List, Set, Tuple, Type, Union
+
+from beanie import PydanticObjectId
+
+from server.config.factory import settings
+from server.models.base import BaseDocumentModel
+from server.models.documents.products import ProductDocument, ShopDocument
+from server.utils.autocomplete import PrefixIndex
+
+
+class NameAutocomplete:
+    def __init__(self, document_model: Type[BaseDocumentModel], interval: float, batch_size: int):
+        self.document_model = document_model
+        self.interval = interval
+        self.batch_size = batch_size
+        self.index = PrefixIndex(
+            max_entries=settings.AUTOCOMPLETE_MAX_ENTRIES,
+            max_prefix_length=settings.AUTOCOMPLETE_MAX_PREFIX_LENGTH,
+            top_k=settings.AUTOCOMPLETE_TOP_K,
+        )
+        self.touched: Union[Set[str], None] = None
+        self.task: Union[asyncio.Task, None] = None
+
+    def suggest(self, prefix: str, limit: Union[int, None] = None) -> List[Tuple[str, str]]:
+        return self.index.suggest(prefix, limit)
+
+    def add(self, document_id: PydanticObjectId, name: str):
+        key = str(document_id)
+        if self.touched is not None:
+            self.touched.add(key)
+        self.index.add(key, name)
+
+    def remove(self, *document_ids: PydanticObjectId):
+        for document_id in document_ids:
+            key = str(document_id)
+            if self.touched is not None:
+                self.touched.add(key)
+            self.index.remove(key)
+
+    def hit(self, document_id: Union[PydanticObjectId, str]):
+        self.index.hit(str(document_id))
+
+    async def sync(self, document_ids: Iterable[PydanticObjectId]):
+        document_ids = list(document_ids)
+        if not document_ids:
+            return
+
+        names = {
+            document["_id"]: document["name"]
+            async for document in self.document_model.get_motor_collection().find(
+                {"_id": {"$in": document_ids}}, {"name": 1}
+            )
+        }
+        for document_id in document_ids:
+            if document_id in names:
+                self.add(document_id, names[document_id])
+            else:
+                self.remove(document_id)
+
+    async def load(self):
+        seen: Set[str] = set()
+        self.touched = set()
+        try:
+            cursor = self.document_model.get_motor_collection().find({}, {"name": 1}, batch_size=self.batch_size)
+            async for document in cursor:
+                key = str(document["_id"])
+                seen.add(key)
+                if key not in self.touched:
+                    self.index.add(key, document["name"])
+                if len(seen) % self.batch_size == 0:
+                    await asyncio.sleep(0)
+
+            stale = [key for key in self.index.names if key not in seen and key not in self.touched]
+            for count, key in enumerate(stale, start=1):
+                self.index.remove(key)
+                if count % self.batch_size == 0:
+                    await asyncio.sleep(0)
+        finally:
+            self.touched = None
+
+    async def run(self):
+        while True:
+            started_at = asyncio.get_running_loop().time()
+            try:
+                await self.load()
+                elapsed = asyncio.get_running_loop().time() - started_at
+                print(f"{self.document_model.__name__} autocomplete loaded {len(self.index)} names in {elapsed:.1f}s!")
+            except Exception as e:
+                print(f"Failed to refresh {self.document_model.__name__} autocomplete: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+
+    def stats(self) -> Dict[str, int]:
+        return self.index.stats()
+
+
+shop_autocomplete = NameAutocomplete(
+    ShopDocument,
+    interval=settings.AUTOCOMPLETE_REFRESH_INTERVAL,
+    batch_size=settings.AUTOCOMPLETE_LOAD_BATCH_SIZE,
+)
+product_autocomplete = NameAutocomplete(
+    ProductDocument,
+    interval=settings.AUTOCOMPLETE_REFRESH_INTERVAL,
+    batch_size=settings.AUTOCOMPLETE_LOAD_BATCH_SIZE,
+)
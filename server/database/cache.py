@@ -0,0 +1,68 @@
+from typing import Dict, Union
+
+from redis.asyncio import Redis
+
+from server.config.factory import settings
+from server.database.managers import get_redis_client
+from server.utils.caches import LocalCache
+
+
+class ReadThroughCache:
+    def __init__(self, namespace: str, max_size: int, local_ttl: float, ttl: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = LocalCache(max_size=max_size, ttl=local_ttl)
+        self.local_hits: int = 0
+        self.redis_hits: int = 0
+        self.misses: int = 0
+
+    def cache_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Union[str, None]:
+        data = self.local.get(key)
+        if data is not None:
+            self.local_hits += 1
+            return data
+
+        client: Redis = get_redis_client()
+        cached = await client.get(self.cache_key(key))
+        if cached is None:
+            self.misses += 1
+            return None
+
+        self.redis_hits += 1
+        data = cached.decode("utf-8")
+        self.local.set(key, data)
+        return data
+
+    async def set(self, key: str, data: str):
+        client: Redis = get_redis_client()
+        await client.set(self.cache_key(key), data, ex=self.ttl)
+        self.local.set(key, data)
+
+    async def invalidate(self, *keys: str):
+        if not keys:
+            return
+
+        for key in keys:
+            self.local.pop(key)
+
+        client: Redis = get_redis_client()
+        await client.delete(*[self.cache_key(key) for key in keys])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "size": len(self.local),
+        }
+
+
+product_cache = ReadThroughCache(
+    namespace="products",
+    max_size=settings.PRODUCT_CACHE_LOCAL_SIZE,
+    local_ttl=settings.PRODUCT_CACHE_LOCAL_TTL,
+    ttl=settings.PRODUCT_CACHE_TTL,
+)
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from functools import lru_cache
 from typing import Any, List, Union
@@ -5,8 +6,10 @@ from typing import Any, List, Union
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import parse_obj_as
-from redis import Redis
-from sqlmodel import create_engine
+from redis.asyncio import ConnectionPool, Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
 
 from server.config.factory import settings
 from server.models.base import MapperSchema
@@ -14,9 +17,40 @@ from server.models.schemas.users import BaseSQLTable as UserTables
 from server.utils.messages import raise_410_gone
 
 
-def create_db_and_tables():
-    engine = create_engine(settings.RDS_URI_SYNC, echo=True)
-    UserTables.metadata.create_all(engine)
+@lru_cache()
+def get_async_database_engine() -> AsyncEngine:
+    return create_async_engine(
+        settings.RDS_URI,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        connect_args={"statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE},
+    )
+
+
+@lru_cache()
+def get_async_session_factory() -> sessionmaker:
+    return sessionmaker(get_async_database_engine(), expire_on_commit=False, class_=AsyncSession)
+
+
+async def create_db_and_tables():
+    engine: AsyncEngine = get_async_database_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(UserTables.metadata.create_all)
+
+
+async def ping_database():
+    engine: AsyncEngine = get_async_database_engine()
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def dispose_database_engine():
+    engine: AsyncEngine = get_async_database_engine()
+    await engine.dispose()
+    get_async_session_factory.cache_clear()
+    get_async_database_engine.cache_clear()
 
 
 def database_collection_mappers() -> List[MapperSchema]:
@@ -36,47 +70,62 @@ def database_collection_mappers() -> List[MapperSchema]:
 async def pool_database_clients():
     client = AsyncIOMotorClient(settings.MONGO_URI)
     mappers = database_collection_mappers()
-    for mapper in mappers:
-        await init_beanie(
-            database=client[mapper.database_name],
-            document_models=mapper.model_paths,
-        )
+    await asyncio.gather(
+        *[
+            init_beanie(
+                database=client[mapper.database_name],
+                document_models=mapper.model_paths,
+            )
+            for mapper in mappers
+        ]
+    )
+
+
+@lru_cache()
+def get_redis_connection_pool() -> ConnectionPool:
+    return ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+    )
 
 
 @lru_cache()
 def get_redis_client() -> Redis:
-    return Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+    return Redis(connection_pool=get_redis_connection_pool())
 
 
-def ping_redis_server():
+async def ping_redis_server():
     client: Redis = get_redis_client()
-    return client.ping()
+    return await client.ping()
 
 
-def cache_data(*, key: str, data: Any, ttl: Union[int, None] = None):
+async def close_redis_client():
     client: Redis = get_redis_client()
-    client.set(key, data, ex=ttl)
+    await client.close()
+    await get_redis_connection_pool().disconnect()
+    get_redis_client.cache_clear()
+    get_redis_connection_pool.cache_clear()
 
 
-def read_from_cache(*, key: str):
+async def cache_data(*, key: str, data: Any, ttl: Union[int, None] = None):
+    client: Redis = get_redis_client()
+    await client.set(key, data, ex=ttl)
+
+
+async def read_from_cache(*, key: str):
     try:
         client: Redis = get_redis_client()
-        data = json.loads(client.get(key).decode("utf-8"))
+        data = json.loads((await client.get(key)).decode("utf-8"))
         return data
     except AttributeError:
         raise_410_gone(message="Key has expired!")
 
 
-def pop_from_cache(*, key: str):
+async def pop_from_cache(*, key: str):
     try:
         client: Redis = get_redis_client()
-        data = json.loads(client.get(key).decode("utf-8"))
-        client.delete(key)
+        data = json.loads((await client.getdel(key)).decode("utf-8"))
         return data
     except AttributeError:
         raise_410_gone(message="Key has expired!")
-
-
-def validate_key(*, key: str):
-    client: Redis = get_redis_client()
-    return client.exists(key)
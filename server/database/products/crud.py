@@ -1,12 +1,43 @@
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
 
+import orjson
 from beanie import PydanticObjectId
+from bson.errors import InvalidId
 from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo import DeleteMany, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
 
-from server.database.shops.crud import read_shop_by_id
+from server.config.factory import settings
+from server.database.autocomplete import product_autocomplete
+from server.database.cache import product_cache
+from server.database.shops.crud import (
+    read_shop_by_id,
+    read_shop_ids_by_owner,
+    read_shops_by_ids,
+)
+from server.models.base import construct_model, trusted_projection
 from server.models.documents.products import ProductDocument
-from server.schemas.inc.products import ProductRequest
-from server.utils.messages import raise_403_forbidden, raise_404_not_found
+from server.schemas.common.products import ShopReference
+from server.schemas.inc.products import (
+    ProductBulkDeleteRequest,
+    ProductBulkUpdateRequest,
+    ProductRequest,
+    ProductSearchQuery,
+)
+from server.utils.cursors import (
+    decode_object_id_cursor,
+    decode_offset_cursor,
+    split_page,
+    split_page_by_offset,
+)
+from server.utils.messages import (
+    raise_400_bad_request,
+    raise_403_forbidden,
+    raise_404_not_found,
+    raise_409_conflict,
+)
 
 
 async def create_product(product: ProductRequest, owner_id: int) -> ProductDocument:
@@ -15,30 +46,320 @@ async def create_product(product: ProductRequest, owner_id: int) -> ProductDocum
         if shop.owner_id != owner_id:
             raise_403_forbidden("You are not the owner of this shop")
 
-        product = ProductDocument(**product.dict(), shop=shop)
+        product = ProductDocument(**product.dict(), shop=ShopReference(id=shop.id, name=shop.name))
         await ProductDocument.insert_one(product)
+        product_autocomplete.add(product.id, product.name)
         return product
     except HTTPException as e:
         raise e
 
 
-async def read_product_by_id(product_id: str) -> ProductDocument:
-    product = await ProductDocument.get(PydanticObjectId(product_id))
+def parse_object_id(value: str) -> PydanticObjectId:
+    try:
+        return PydanticObjectId(value)
+    except (InvalidId, TypeError):
+        raise_400_bad_request("Invalid ID.")
+
+
+def parse_object_ids(ids: List[str]) -> List[PydanticObjectId]:
+    return [parse_object_id(value) for value in ids]
+
+
+async def read_product_by_id(product_id: str, use_cache: bool = True) -> ProductDocument:
+    object_id = parse_object_id(product_id)
+    if use_cache:
+        cached_product = await product_cache.get(str(object_id))
+        if cached_product is not None:
+            return construct_model(ProductDocument, orjson.loads(cached_product))
+
+    product = await ProductDocument.get_trusted(object_id)
     if not product:
         raise_404_not_found("Product not found")
+
+    if use_cache:
+        await product_cache.set(str(object_id), product.json())
     return product
 
 
-async def read_products(page: int, limit: int = 10) -> List[ProductDocument]:
-    products = await ProductDocument.find().skip((page - 1) * limit).limit(limit).to_list()
-    return products
+async def read_products(
+    page: int = 1,
+    limit: int = 10,
+    cursor: Union[str, None] = None,
+    fields: Union[Tuple[str, ...], None] = None,
+) -> Tuple[List[ProductDocument], Union[str, None]]:
+    if cursor:
+        query = ProductDocument.find(ProductDocument.id > decode_object_id_cursor(cursor))
+    else:
+        query = ProductDocument.find().skip((page - 1) * limit)
+
+    products = await ProductDocument.find_trusted(query.sort(+ProductDocument.id).limit(limit + 1), fields)
+    return split_page(products, limit, "id")
+
+
+def build_product_search_filter(query: ProductSearchQuery) -> Dict[str, Any]:
+    conditions: Dict[str, Any] = {}
+    if query.text:
+        conditions["$text"] = {"$search": query.text}
+    if query.brands:
+        conditions["brand"] = {"$in": query.brands}
+    if query.colors:
+        conditions["colors"] = {"$in": query.colors}
+    if query.sizes:
+        conditions["available_sizes"] = {"$in": query.sizes}
+
+    price = {}
+    if query.min_price is not None:
+        price["$gte"] = query.min_price
+    if query.max_price is not None:
+        price["$lte"] = query.max_price
+    if price:
+        conditions["price"] = price
+
+    if query.min_rating is not None:
+        conditions["rating"] = {"$gte": query.min_rating}
+    return conditions
+
+
+def build_product_search_pipeline(query: ProductSearchQuery, offset: int, limit: int) -> List[Dict[str, Any]]:
+    if query.text:
+        sort = {"score": {"$meta": "textScore"}, "_id": 1}
+    else:
+        sort = {"price": 1, "_id": 1}
+
+    return [
+        {"$match": build_product_search_filter(query)},
+        {"$sort": sort},
+        {
+            "$facet": {
+                "items": [
+                    {"$skip": offset},
+                    {"$limit": limit + 1},
+                    {"$project": trusted_projection(ProductDocument)},
+                ],
+                "brands": [{"$sortByCount": "$brand"}],
+                "colors": [{"$unwind": "$colors"}, {"$sortByCount": "$colors"}],
+                "sizes": [{"$unwind": "$available_sizes"}, {"$sortByCount": "$available_sizes"}],
+                "prices": [{"$bucketAuto": {"groupBy": "$price", "buckets": settings.PRODUCT_SEARCH_PRICE_BUCKETS}}],
+                "total": [{"$count": "count"}],
+            },
+        },
+    ]
+
+
+def format_facet_counts(buckets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{"value": bucket["_id"], "count": bucket["count"]} for bucket in buckets if bucket["_id"] is not None]
+
+
+async def search_products(
+    query: ProductSearchQuery,
+    page: int = 1,
+    limit: int = 10,
+    cursor: Union[str, None] = None,
+) -> Tuple[Dict[str, Any], Union[str, None]]:
+    offset = decode_offset_cursor(cursor) if cursor else (page - 1) * limit
+    pipeline = build_product_search_pipeline(query, offset, limit)
+    results = await ProductDocument.get_motor_collection().aggregate(pipeline).to_list(length=1)
+    result = results[0]
+
+    products = [construct_model(ProductDocument, item) for item in result["items"]]
+    products, next_cursor = split_page_by_offset(products, limit, offset)
+    return {
+        "total": result["total"][0]["count"] if result["total"] else 0,
+        "items": products,
+        "facets": {
+            "brands": format_facet_counts(result["brands"]),
+            "colors": format_facet_counts(result["colors"]),
+            "sizes": format_facet_counts(result["sizes"]),
+            "prices": [
+                {"min": bucket["_id"]["min"], "max": bucket["_id"]["max"], "count": bucket["count"]}
+                for bucket in result["prices"]
+            ],
+        },
+    }, next_cursor
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in error.errors())
+
+
+async def resolve_import_shops(
+    shop_ids: List[str],
+    owner_id: int,
+    shops: Dict[str, Union[ShopReference, str]],
+):
+    object_ids = {}
+    for shop_id in set(shop_ids) - shops.keys():
+        try:
+            object_ids[shop_id] = PydanticObjectId(shop_id)
+        except (InvalidId, TypeError):
+            shops[shop_id] = "Shop not found"
+
+    found_shops = await read_shops_by_ids(list(object_ids.values()))
+    for shop_id, object_id in object_ids.items():
+        shop = found_shops.get(object_id)
+        if not shop:
+            shops[shop_id] = "Shop not found"
+        elif shop.owner_id != owner_id:
+            shops[shop_id] = "You are not the owner of this shop"
+        else:
+            shops[shop_id] = ShopReference(id=shop.id, name=shop.name)
+
+
+async def insert_product_batch(
+    rows: List[Tuple[int, ProductRequest]],
+    owner_id: int,
+    shops: Dict[str, Union[ShopReference, str]],
+    errors: List[Dict[str, Any]],
+) -> int:
+    await resolve_import_shops([row.shop_id for _, row in rows], owner_id, shops)
 
+    line_numbers, products = [], []
+    for line_number, row in rows:
+        shop = shops[row.shop_id]
+        if isinstance(shop, str):
+            errors.append({"line": line_number, "msg": shop})
+            continue
+        line_numbers.append(line_number)
+        products.append(ProductDocument(**row.dict(), shop=shop, id=PydanticObjectId()))
 
-async def update_product_by_id(product_id: str, product: ProductRequest) -> ProductDocument:
-    existing_product = await read_product_by_id(product_id)
-    updated_product = await ProductDocument(**{**existing_product.dict(), **product.dict(exclude_unset=True)}).save()
+    if not products:
+        return 0
+
+    failed = set()
+    try:
+        await ProductDocument.insert_many(products, ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details["writeErrors"]:
+            failed.add(write_error["index"])
+            errors.append({"line": line_numbers[write_error["index"]], "msg": write_error["errmsg"]})
+
+    for index, product in enumerate(products):
+        if index not in failed:
+            product_autocomplete.add(product.id, product.name)
+    return len(products) - len(failed)
+
+
+async def import_products(lines: AsyncIterator[bytes], owner_id: int, batch_size: int = 1000) -> Dict[str, Any]:
+    shops: Dict[str, Union[ShopReference, str]] = {}
+    rows: List[Tuple[int, ProductRequest]] = []
+    errors: List[Dict[str, Any]] = []
+    inserted = 0
+    line_number = 0
+
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+
+        try:
+            rows.append((line_number, ProductRequest.parse_raw(line)))
+        except ValidationError as e:
+            errors.append({"line": line_number, "msg": format_validation_error(e)})
+
+        if len(rows) >= batch_size:
+            inserted += await insert_product_batch(rows, owner_id, shops, errors)
+            rows = []
+
+    if rows:
+        inserted += await insert_product_batch(rows, owner_id, shops, errors)
+
+    return {"inserted": inserted, "errors": sorted(errors, key=lambda error: error["line"])}
+
+
+async def attach_shop_details(products: List[ProductDocument]) -> List[Dict[str, Any]]:
+    shops = await read_shops_by_ids([product.shop.id for product in products])
+    return [{**product.dict(), "shop_details": shops.get(product.shop.id)} for product in products]
+
+
+async def update_product_by_id(
+    product_id: str,
+    product: ProductRequest,
+    version: Union[int, None] = None,
+) -> ProductDocument:
+    object_id = parse_object_id(product_id)
+    updated_product = await ProductDocument.update_fields(
+        ProductDocument.id == object_id,
+        fields=product.dict(exclude_unset=True),
+        version=version,
+    )
+    if not updated_product:
+        if version is not None and await ProductDocument.find_one(ProductDocument.id == object_id):
+            raise_409_conflict("Product was modified by another request")
+        raise_404_not_found("Product not found")
+
+    await product_cache.invalidate(str(object_id))
+    if product.name is not None:
+        product_autocomplete.add(updated_product.id, updated_product.name)
     return updated_product
 
 
 async def delete_product_by_id(product_id: str):
-    await ProductDocument.find_one(ProductDocument.id == PydanticObjectId(product_id)).delete()
+    object_id = parse_object_id(product_id)
+    await ProductDocument.find_one(ProductDocument.id == object_id).delete()
+    await product_cache.invalidate(str(object_id))
+    product_autocomplete.remove(object_id)
+
+
+async def update_products_in_bulk(request: ProductBulkUpdateRequest, owner_id: int) -> Dict[str, int]:
+    collection = ProductDocument.get_motor_collection()
+    owned_shop_ids = await read_shop_ids_by_owner(owner_id)
+    last_updated_at = datetime.utcnow()
+
+    if request.items:
+        product_ids = parse_object_ids([item.id for item in request.items])
+        renamed_ids = [product_id for product_id, item in zip(product_ids, request.items) if item.changes.name]
+        operations = [
+            UpdateOne(
+                {"_id": product_id, "shop.id": {"$in": owned_shop_ids}},
+                {
+                    "$set": {**item.changes.dict(exclude_unset=True), "last_updated_at": last_updated_at},
+                    "$inc": {"version": 1},
+                },
+            )
+            for product_id, item in zip(product_ids, request.items)
+        ]
+    else:
+        shop_ids = [shop_id for shop_id in parse_object_ids(request.shop_ids) if shop_id in owned_shop_ids]
+        query = {"shop.id": {"$in": shop_ids}}
+        product_ids = await collection.distinct("_id", query)
+        renamed_ids = product_ids if request.changes.name else []
+        operations = [
+            UpdateMany(
+                query,
+                {
+                    "$set": {**request.changes.dict(exclude_unset=True), "last_updated_at": last_updated_at},
+                    "$inc": {"version": 1},
+                },
+            )
+        ]
+
+    result = await collection.bulk_write(operations, ordered=False)
+    await product_cache.invalidate(*[str(product_id) for product_id in product_ids])
+    await product_autocomplete.sync(renamed_ids)
+    return {"matched": result.matched_count, "modified": result.modified_count}
+
+
+async def delete_products_in_bulk(request: ProductBulkDeleteRequest, owner_id: int) -> Dict[str, int]:
+    collection = ProductDocument.get_motor_collection()
+    owned_shop_ids = await read_shop_ids_by_owner(owner_id)
+
+    if request.ids:
+        product_ids = parse_object_ids(request.ids)
+        query = {"_id": {"$in": product_ids}, "shop.id": {"$in": owned_shop_ids}}
+    else:
+        shop_ids = [shop_id for shop_id in parse_object_ids(request.shop_ids) if shop_id in owned_shop_ids]
+        query = {"shop.id": {"$in": shop_ids}}
+        product_ids = await collection.distinct("_id", query)
+
+    result = await collection.bulk_write([DeleteMany(query)], ordered=False)
+    await product_cache.invalidate(*[str(product_id) for product_id in product_ids])
+    await product_autocomplete.sync(product_ids)
+    return {"deleted": result.deleted_count}
+
+
+async def migrate_embedded_shops() -> int:
+    result = await ProductDocument.get_motor_collection().update_many(
+        {"shop._id": {"$exists": True}},
+        [{"$set": {"shop": {"id": "$shop._id", "name": "$shop.name"}}}],
+    )
+    return result.modified_count
@@ -1,46 +1,156 @@
-from typing import List
+from typing import Any, Dict, List, Tuple, Union
 
 from beanie import PydanticObjectId
+from beanie.odm.operators.find.comparison import In
 from beanie.odm.operators.find.evaluation import Text
+from beanie.odm.operators.find.logical import And, Or
+from beanie.odm.operators.update.general import Set
 
-from server.models.documents.products import ShopDocument
+from server.database.autocomplete import shop_autocomplete
+from server.database.cache import product_cache
+from server.models.documents.products import ProductDocument, ShopDocument
 from server.schemas.inc.products import ShopRequest
-from server.utils.messages import raise_404_not_found
+from server.utils.cursors import (
+    decode_cursor,
+    decode_object_id_cursor,
+    decode_offset_cursor,
+    split_page,
+    split_page_by_offset,
+)
+from server.utils.fieldsets import extend_fieldset
+from server.utils.messages import (
+    raise_400_bad_request,
+    raise_404_not_found,
+    raise_409_conflict,
+)
 
 
 async def create_shop(shop: ShopRequest, owner_id: int) -> ShopDocument:
     shop = await ShopDocument.insert_one(ShopDocument(**shop.dict(), owner_id=owner_id))
+    shop_autocomplete.add(shop.id, shop.name)
     return shop
 
 
-async def read_shop_by_id(shop_id: str) -> ShopDocument:
-    shop = await ShopDocument.get(PydanticObjectId(shop_id))
+async def read_shop_by_id(shop_id: str, fields: Union[Tuple[str, ...], None] = None) -> ShopDocument:
+    shop = await ShopDocument.get_trusted(PydanticObjectId(shop_id), fields)
     if not shop:
         raise raise_404_not_found("Shop not found")
     return shop
 
 
-async def read_shop_by_owner(owner_id: int, page: int, limit: int = 10) -> List[ShopDocument]:
-    shops = (
-        await ShopDocument.find(ShopDocument.owner_id == owner_id)
-        .sort(+ShopDocument.name)
-        .skip((page - 1) * limit)
-        .limit(limit)
-        .to_list()
+async def read_shops_by_ids(shop_ids: List[PydanticObjectId]) -> Dict[PydanticObjectId, ShopDocument]:
+    if not shop_ids:
+        return {}
+
+    shops = await ShopDocument.find_trusted(ShopDocument.find(In(ShopDocument.id, list(set(shop_ids)))))
+    return {shop.id: shop for shop in shops}
+
+
+async def read_shop_ids_by_owner(owner_id: int) -> List[PydanticObjectId]:
+    return await ShopDocument.get_motor_collection().distinct("_id", {"owner_id": owner_id})
+
+
+def shops_after_cursor(cursor: Union[str, None]) -> List[Any]:
+    if not cursor:
+        return []
+
+    name = decode_cursor(cursor).get("name")
+    if not isinstance(name, str):
+        raise_400_bad_request("Invalid cursor.")
+
+    shop_id = decode_object_id_cursor(cursor)
+    return [Or(ShopDocument.name > name, And(ShopDocument.name == name, ShopDocument.id > shop_id))]
+
+
+async def read_shops_by_name(
+    *filters: Any,
+    page: int = 1,
+    limit: int = 10,
+    cursor: Union[str, None] = None,
+    fields: Union[Tuple[str, ...], None] = None,
+) -> Tuple[List[ShopDocument], Union[str, None]]:
+    query = ShopDocument.find(*filters, *shops_after_cursor(cursor))
+    if not cursor:
+        query = query.skip((page - 1) * limit)
+
+    shops = await ShopDocument.find_trusted(
+        query.sort(+ShopDocument.name, +ShopDocument.id).limit(limit + 1),
+        extend_fieldset(fields, "name", "id"),
     )
-    return shops
+    return split_page(shops, limit, "name", "id")
 
 
-async def search_shops_by_name(name: str, page: int, limit: int = 10) -> List[ShopDocument]:
-    shops = await ShopDocument.find(Text(name)).sort(+ShopDocument.name).skip((page - 1) * limit).limit(limit).to_list()
-    return shops
+async def read_shop_by_owner(
+    owner_id: int,
+    page: int = 1,
+    limit: int = 10,
+    cursor: Union[str, None] = None,
+    fields: Union[Tuple[str, ...], None] = None,
+) -> Tuple[List[ShopDocument], Union[str, None]]:
+    return await read_shops_by_name(
+        ShopDocument.owner_id == owner_id,
+        page=page,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
 
 
-async def update_shop(shop_id: str, owner_id: int, shop: ShopRequest) -> ShopDocument:
-    existing_shop = await ShopDocument.find_one(
-        ShopDocument.id == PydanticObjectId(shop_id), ShopDocument.owner_id == owner_id
+async def search_shops_by_name(
+    name: Union[str, None],
+    page: int = 1,
+    limit: int = 10,
+    cursor: Union[str, None] = None,
+    fields: Union[Tuple[str, ...], None] = None,
+) -> Tuple[List[ShopDocument], Union[str, None]]:
+    if not name:
+        return await read_shops_by_name(page=page, limit=limit, cursor=cursor, fields=fields)
+
+    offset = decode_offset_cursor(cursor) if cursor else (page - 1) * limit
+    shops = await ShopDocument.find_trusted(
+        ShopDocument.find(Text(name))
+        .sort(("score", {"$meta": "textScore"}), +ShopDocument.id)
+        .skip(offset)
+        .limit(limit + 1),
+        fields,
+    )
+    return split_page_by_offset(shops, limit, offset)
+
+
+async def read_owned_shop(shop_id: str, owner_id: int) -> Union[ShopDocument, None]:
+    return await ShopDocument.find_one(ShopDocument.id == PydanticObjectId(shop_id), ShopDocument.owner_id == owner_id)
+
+
+async def invalidate_shop_products(shop_id: str):
+    product_ids = await ProductDocument.get_motor_collection().distinct("_id", {"shop.id": PydanticObjectId(shop_id)})
+    await product_cache.invalidate(*[str(product_id) for product_id in product_ids])
+
+
+async def update_shop(
+    shop_id: str,
+    owner_id: int,
+    shop: ShopRequest,
+    version: Union[int, None] = None,
+) -> ShopDocument:
+    fields = shop.dict(exclude_unset=True)
+    updated_shop = await ShopDocument.update_fields(
+        ShopDocument.id == PydanticObjectId(shop_id),
+        ShopDocument.owner_id == owner_id,
+        fields=fields,
+        version=version,
     )
-    updated_shop = await ShopDocument(**{**existing_shop.dict(), **shop.dict(exclude_unset=True)}).save()
+    if not updated_shop:
+        if version is not None and await read_owned_shop(shop_id, owner_id):
+            raise_409_conflict("Shop was modified by another request")
+        raise_404_not_found("Shop not found")
+
+    if "name" in fields:
+        await ProductDocument.find(
+            ProductDocument.shop.id == updated_shop.id,
+            ProductDocument.shop.name != updated_shop.name,
+        ).update(Set({ProductDocument.shop.name: updated_shop.name}))
+        await invalidate_shop_products(shop_id)
+        shop_autocomplete.add(updated_shop.id, updated_shop.name)
     return updated_shop
 
 
@@ -48,3 +158,4 @@ async def delete_shop(shop_id: str, owner_id: int):
     await ShopDocument.find_one(
         ShopDocument.id == PydanticObjectId(shop_id), ShopDocument.owner_id == owner_id
     ).delete()
+    await shop_autocomplete.sync([PydanticObjectId(shop_id)])
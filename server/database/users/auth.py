@@ -13,7 +13,7 @@ from server.utils.messages import (
 
 
 async def create_user_account(session: AsyncSession, payload: SignupRequestSchema) -> UserAccount:
-    hashed_password = pwd_context.hash_plain_password(payload.password)
+    hashed_password = await pwd_context.hash_plain_password_async(payload.password)
     user = UserAccount(
         username=payload.username,
         email=payload.email,
@@ -38,7 +38,7 @@ async def authenticate_user(session: AsyncSession, username: str, password: str)
     if not user.is_active:
         raise_403_forbidden(message=f"The account for username {username} is not activated.")
 
-    if not pwd_context.verify_password(password, user.hashed_password):
+    if not await pwd_context.verify_password_async(password, user.hashed_password):
         raise_401_unauthorized(message="Incorrect password.")
 
     return user
@@ -73,10 +73,10 @@ async def update_password(
     query = await session.execute(stmt)
     user = query.scalar()
 
-    if not pwd_context.verify_password(payload.current_password, user.hashed_password):
+    if not await pwd_context.verify_password_async(payload.current_password, user.hashed_password):
         raise_401_unauthorized(message="Incorrect password.")
 
-    user.hashed_password = pwd_context.hash_plain_password(payload.new_password)
+    user.hashed_password = await pwd_context.hash_plain_password_async(payload.new_password)
     session.add(user)
     await session.commit()
     await session.refresh(user)
@@ -91,7 +91,7 @@ async def reset_password(
     query = await session.execute(stmt)
     user = query.scalar()
 
-    user.hashed_password = pwd_context.hash_plain_password(new_password)
+    user.hashed_password = await pwd_context.hash_plain_password_async(new_password)
     session.add(user)
     await session.commit()
     await session.refresh(user)
@@ -1,43 +1,166 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable
+
+from fastapi import FastAPI, Response
 
 from server.config.factory import settings
+from server.database.autocomplete import product_autocomplete, shop_autocomplete
+from server.database.cache import product_cache
 from server.database.managers import (
+    close_redis_client,
     create_db_and_tables,
+    dispose_database_engine,
+    ping_database,
     ping_redis_server,
     pool_database_clients,
 )
-from server.routes.auth import router as auth_router
-from server.routes.products import router as products_router
-from server.routes.shops import router as shops_router
-from server.routes.users import router as users_router
-from server.schemas.base import HealthResponseSchema
+from server.schemas.base import (
+    CacheHealthResponseSchema,
+    HealthResponseSchema,
+    JWKSResponseSchema,
+    PasswordHashingHealthResponseSchema,
+)
+from server.security.authentication import pwd_context
+from server.security.keys import get_key_ring
+from server.security.revocation import session_denylist
+from server.utils.responses import ORJSONResponse
+
+
+async def run_startup_phase(name: str, phase: Awaitable[Any]):
+    started_at = time.perf_counter()
+    print(f"{name} starting...")
+    try:
+        await asyncio.wait_for(phase, timeout=settings.STARTUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise RuntimeError(f"{name} not ready after {settings.STARTUP_TIMEOUT}s")
+    print(f"{name} ready in {(time.perf_counter() - started_at) * 1000:.0f}ms!")
+
+
+async def prepare_relational_database():
+    if settings.STARTUP_CREATE_TABLES:
+        await create_db_and_tables()
+    else:
+        await ping_database()
+
+
+async def prepare_document_database():
+    await pool_database_clients()
+    await shop_autocomplete.start()
+    await product_autocomplete.start()
 
-app = FastAPI()
-app.include_router(auth_router)
-app.include_router(users_router)
-app.include_router(products_router)
-app.include_router(shops_router)
+
+async def prepare_redis_server():
+    await ping_redis_server()
+    await session_denylist.start()
+
+
+async def prepare_mail_dispatcher():
+    from server.utils.mailer import get_mail_dispatcher
+    from server.utils.templates import get_template_renderer
+
+    await asyncio.to_thread(get_template_renderer().load)
+    await get_mail_dispatcher().start()
 
 
-@app.on_event("startup")
 async def on_startup():
     print("Starting up...")
+    started_at = time.perf_counter()
 
-    print("Creating relational database and tables...")
-    create_db_and_tables()
-    print("Relational database and tables created!")
+    phases = [
+        run_startup_phase("Relational database", prepare_relational_database()),
+        run_startup_phase("NoSQL database", prepare_document_database()),
+        run_startup_phase("Redis server", prepare_redis_server()),
+    ]
+    if not settings.MAIL_JOBS_ENABLED:
+        phases.append(run_startup_phase("Mail dispatcher", prepare_mail_dispatcher()))
+    await asyncio.gather(*phases)
 
-    print("Pooling NoSQL database connections...")
-    await pool_database_clients()
-    print("NoSQL database connections pooled!")
+    print(f"Startup complete in {(time.perf_counter() - started_at) * 1000:.0f}ms!")
+
+
+async def on_shutdown():
+    print("Shutting down...")
+
+    if not settings.MAIL_JOBS_ENABLED:
+        from server.utils.mailer import get_mail_dispatcher
+
+        print("Stopping mail dispatcher...")
+        await get_mail_dispatcher().stop()
+        print("Mail dispatcher stopped!")
 
-    print("Ping Redis server...")
-    ping_redis_server()
-    print("Redis server pinged!")
+    print("Disposing relational database connection pool...")
+    await dispose_database_engine()
+    print("Relational database connection pool disposed!")
 
-    print("Startup complete!")
+    print("Stopping autocomplete refresh...")
+    await asyncio.gather(shop_autocomplete.stop(), product_autocomplete.stop())
+    print("Autocomplete refresh stopped!")
+
+    print("Stopping revoked session sync...")
+    await session_denylist.stop()
+    print("Revoked session sync stopped!")
+
+    print("Closing Redis connection pool...")
+    await close_redis_client()
+    print("Redis connection pool closed!")
+
+    print("Shutting down password hashing pool...")
+    pwd_context.shutdown()
+    print("Password hashing pool shut down!")
+
+    print("Shutdown complete!")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await on_startup()
+    yield
+    await on_shutdown()
 
 
-@app.get("/health", response_model=HealthResponseSchema)
 async def health():
     return settings
+
+
+async def cache_health():
+    return {
+        "products": product_cache.stats(),
+        "shop_names": shop_autocomplete.stats(),
+        "product_names": product_autocomplete.stats(),
+    }
+
+
+async def password_hashing_health():
+    return pwd_context.stats()
+
+
+async def jwks(response: Response):
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_key_ring().jwks()
+
+
+def create_app() -> FastAPI:
+    from server.routes.auth import router as auth_router
+    from server.routes.products import router as products_router
+    from server.routes.shops import router as shops_router
+    from server.routes.users import router as users_router
+
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+    app.include_router(auth_router)
+    app.include_router(users_router)
+    app.include_router(products_router)
+    app.include_router(shops_router)
+
+    app.add_api_route("/health", health, methods=["GET"], response_model=HealthResponseSchema)
+    app.add_api_route("/health/cache", cache_health, methods=["GET"], response_model=CacheHealthResponseSchema)
+    app.add_api_route(
+        "/health/hashing",
+        password_hashing_health,
+        methods=["GET"],
+        response_model=PasswordHashingHealthResponseSchema,
+    )
+    app.add_api_route("/.well-known/jwks.json", jwks, methods=["GET"], response_model=JWKSResponseSchema)
+
+    return app
@@ -1,9 +1,15 @@
 from datetime import datetime
+from functools import lru_cache
 from importlib import import_module
-from typing import List, Union
+from typing import Any, Callable, Dict, List, Mapping, Tuple, Type, TypeVar, Union
 
-from beanie import Document
+from beanie import Document, PydanticObjectId
+from beanie.odm.operators.update.general import Inc, Set
+from beanie.odm.queries.find import FindMany
+from beanie.odm.queries.update import UpdateResponse
 from pydantic import BaseModel, validator
+from pydantic.datetime_parse import parse_datetime
+from pydantic.fields import SHAPE_SINGLETON
 from sqlmodel import Field, SQLModel
 
 from server.utils.formatters import format_datetime_into_isoformat
@@ -20,6 +26,40 @@ class BaseModelConfig(BaseModel):
         json_encoders: dict = {datetime: format_datetime_into_isoformat}
 
 
+ModelType = TypeVar("ModelType", bound=BaseModel)
+DocumentType = TypeVar("DocumentType", bound="BaseDocumentModel")
+
+
+TRUSTED_COERCERS: Dict[type, Callable[[str], Any]] = {
+    PydanticObjectId: PydanticObjectId,
+    datetime: parse_datetime,
+}
+
+
+def construct_model(model: Type[ModelType], data: Mapping[str, Any]) -> ModelType:
+    values = dict(data)
+    for field in model.__fields__.values():
+        key = field.alias if field.alias in values else field.name
+        value = values.get(key)
+        if value is None or field.shape != SHAPE_SINGLETON or not isinstance(field.type_, type):
+            continue
+
+        if isinstance(value, Mapping) and issubclass(field.type_, BaseModel):
+            values[key] = construct_model(field.type_, value)
+        elif isinstance(value, str) and field.type_ in TRUSTED_COERCERS:
+            values[key] = TRUSTED_COERCERS[field.type_](value)
+    return model.construct(**values)
+
+
+@lru_cache(maxsize=256)
+def trusted_projection(model: Type[BaseModel], fields: Union[Tuple[str, ...], None] = None) -> Dict[str, int]:
+    return {
+        field.alias: 1
+        for name, field in model.__fields__.items()
+        if field.field_info.extra.get("hidden") is not True and (fields is None or name in fields)
+    }
+
+
 class BaseSQLTable(SQLModel, BaseModelConfig):
     id: int = Field(index=True, primary_key=True)
 
@@ -29,11 +69,49 @@ class BaseSQLTable(SQLModel, BaseModelConfig):
 
 
 class BaseDocumentModel(Document, BaseModelConfig):
+    version: int = Field(default=0)
+
     async def save(self):
         if self.id:
             self.last_updated_at = datetime.utcnow()
+            self.version += 1
         return await super().save()
 
+    @classmethod
+    async def update_fields(cls, *filters: Any, fields: Dict[str, Any], version: Union[int, None] = None):
+        if version is not None:
+            filters = (*filters, {"version": {"$in": [version, None] if version == 0 else [version]}})
+
+        return await cls.find_one(*filters).update(
+            Set({**fields, "last_updated_at": datetime.utcnow()}),
+            Inc({"version": 1}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+
+    @classmethod
+    async def find_trusted(
+        cls: Type[DocumentType],
+        query: FindMany,
+        fields: Union[Tuple[str, ...], None] = None,
+    ) -> List[DocumentType]:
+        cursor = cls.get_motor_collection().find(
+            filter=query.get_filter_query(),
+            projection=trusted_projection(cls, fields),
+            sort=query.sort_expressions,
+            skip=query.skip_number,
+            limit=query.limit_number,
+        )
+        return [construct_model(cls, document) async for document in cursor]
+
+    @classmethod
+    async def get_trusted(
+        cls: Type[DocumentType],
+        document_id: PydanticObjectId,
+        fields: Union[Tuple[str, ...], None] = None,
+    ) -> Union[DocumentType, None]:
+        document = await cls.get_motor_collection().find_one({"_id": document_id}, trusted_projection(cls, fields))
+        return construct_model(cls, document) if document is not None else None
+
 
 class MapperSchema(BaseModel):
     database_name: str
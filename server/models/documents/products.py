@@ -1,7 +1,7 @@
-from pymongo import TEXT
+from pymongo import ASCENDING, TEXT
 
 from server.models.base import BaseDocumentModel
-from server.schemas.common.products import ProductBase, ShopBase
+from server.schemas.common.products import ProductBase, ShopBase, ShopReference
 
 
 class ShopDocument(BaseDocumentModel, ShopBase):
@@ -10,16 +10,23 @@ class ShopDocument(BaseDocumentModel, ShopBase):
     class Settings:
         name = "shops"
         indexes = [
-            "owner_id",
+            [("owner_id", ASCENDING), ("name", ASCENDING), ("_id", ASCENDING)],
+            [("name", ASCENDING), ("_id", ASCENDING)],
             [("name", TEXT)],
         ]
 
 
 class ProductDocument(BaseDocumentModel, ProductBase):
-    shop: ShopDocument
+    shop: ShopReference
 
     class Settings:
         name = "products"
         indexes = [
+            "shop.id",
             [("name", TEXT)],
+            [("price", ASCENDING), ("_id", ASCENDING)],
+            [("brand", ASCENDING), ("price", ASCENDING), ("_id", ASCENDING)],
+            [("colors", ASCENDING), ("price", ASCENDING), ("_id", ASCENDING)],
+            [("available_sizes", ASCENDING), ("price", ASCENDING), ("_id", ASCENDING)],
+            [("rating", ASCENDING), ("price", ASCENDING), ("_id", ASCENDING)],
         ]
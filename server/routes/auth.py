@@ -1,22 +1,15 @@
-from fastapi import (
-    APIRouter,
-    BackgroundTasks,
-    Depends,
-    HTTPException,
-    Query,
-    Request,
-    status,
-)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.config.factory import settings
-from server.database.managers import cache_data, pop_from_cache, validate_key
+from server.database.managers import cache_data, pop_from_cache
 from server.database.users.auth import (
     activate_user_account,
     authenticate_user,
     create_user_account,
     read_user_by_email,
+    read_user_by_user_id,
     reset_password,
     update_email,
     update_password,
@@ -32,17 +25,28 @@ from server.security.dependencies import (
     authenticate_active_user,
     email_form_field,
     get_database_session,
+    is_user_active,
     login_form,
     password_change_request_form,
     password_reset_request_form,
+    refresh_token_form_field,
     signup_form,
     temporary_url_key,
+    throttle_login,
+    throttle_mail,
+    throttle_signup,
+)
+from server.security.onetime import check_one_time_token, consume_one_time_token
+from server.security.sessions import (
+    create_refresh_token,
+    revoke_sessions,
+    revoke_user_sessions,
+    rotate_refresh_token,
 )
-from server.security.token import create_jwt
+from server.security.token import create_jwt, decode_jwt_claims
 from server.utils.email import send_activation_mail
 from server.utils.enums import Tags
-from server.utils.generators import create_temporary_activation_url
-from server.utils.messages import raise_410_gone
+from server.utils.messages import raise_401_unauthorized, raise_410_gone
 
 router = APIRouter(prefix="/auth", tags=[Tags.authentication])
 
@@ -53,22 +57,18 @@ router = APIRouter(prefix="/auth", tags=[Tags.authentication])
     description="Register a new user account.",
     response_model=MessageResponseSchema,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(throttle_signup)],
 )
 async def register(
     request: Request,
-    task_queue: BackgroundTasks,
     payload: SignupRequestSchema = Depends(signup_form),
     session: AsyncSession = Depends(get_database_session),
 ) -> MessageResponseSchema:
     new_user = await create_user_account(session=session, payload=payload)
-    url = create_temporary_activation_url(new_user, f"{request.base_url}auth/activate")
-
-    task_queue.add_task(
-        send_activation_mail,
-        request,
+    await send_activation_mail(
         f"Account activation for {new_user.username}",
         "activation",
-        url,
+        f"{request.base_url}auth/activate",
         new_user,
     )
 
@@ -81,6 +81,7 @@ async def register(
     description="Authenticate a user account.",
     response_model=TokenResponseSchema,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(throttle_login)],
 )
 async def login(
     payload: LoginRequestSchema = Depends(login_form),
@@ -93,9 +94,59 @@ async def login(
             password=payload.password,
         )
 
-        token = create_jwt(user)
-        cache_data(key=token, data=user.json(), ttl=settings.JWT_MIN * 60)
-        return {"access_token": token, "token_type": "Bearer"}
+        refresh_token, session_id = await create_refresh_token(user)
+        token = create_jwt(user, session_id=session_id)
+        if not settings.JWT_LOCAL_VERIFICATION:
+            await cache_data(key=token, data=user.json(), ttl=settings.JWT_MIN * 60)
+        return {"access_token": token, "token_type": "Bearer", "refresh_token": refresh_token}
+    except HTTPException as e:
+        raise e
+
+
+@router.post(
+    "/refresh",
+    summary="Refresh access token",
+    description="Exchange a refresh token for a new access token and a new refresh token.",
+    response_model=TokenResponseSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def refresh(
+    refresh_token: str = Depends(refresh_token_form_field),
+    session: AsyncSession = Depends(get_database_session),
+) -> TokenResponseSchema:
+    try:
+        user_id, session_id, new_refresh_token = await rotate_refresh_token(refresh_token)
+        user = await read_user_by_user_id(session=session, user_id=user_id)
+        if not user.is_active:
+            await revoke_sessions(user_id, session_id)
+            raise_401_unauthorized("Inactive user")
+
+        token = create_jwt(user, session_id=session_id)
+        if not settings.JWT_LOCAL_VERIFICATION:
+            await cache_data(key=token, data=user.json(), ttl=settings.JWT_MIN * 60)
+        return {"access_token": token, "token_type": "Bearer", "refresh_token": new_refresh_token}
+    except HTTPException as e:
+        raise e
+
+
+@router.post(
+    "/logout",
+    summary="Revoke session",
+    description="Revoke the session of the access token used for the request, including its refresh token.",
+    response_model=MessageResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def logout(token: str = Depends(is_user_active)) -> MessageResponseSchema:
+    try:
+        try:
+            claims = decode_jwt_claims(token)
+        except ValueError:
+            raise_401_unauthorized("Invalid token")
+
+        await revoke_sessions(claims.id, claims.sid)
+        if not settings.JWT_LOCAL_VERIFICATION:
+            await pop_from_cache(key=token)
+        return {"msg": "Logged out."}
     except HTTPException as e:
         raise e
 
@@ -111,7 +162,7 @@ async def activate_account(
     validation_key: str = Depends(temporary_url_key),
     session: AsyncSession = Depends(get_database_session),
 ) -> MessageResponseSchema:
-    user = pop_from_cache(key=validation_key)
+    user = await consume_one_time_token(validation_key, purpose="activation")
     updated_user = await activate_user_account(session=session, user_id=user["id"])
     return {"msg": f"User account {updated_user.username} activated."}
 
@@ -122,16 +173,21 @@ async def activate_account(
     description="Resend activation key to a user.",
     response_model=MessageResponseSchema,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(throttle_mail)],
 )
 async def resend_activation_key(
     request: Request,
-    task_queue: BackgroundTasks,
     email: EmailStr = Depends(email_form_field),
     session: AsyncSession = Depends(get_database_session),
 ):
     try:
         user = await read_user_by_email(session=session, email=email)
-        task_queue.add_task(send_activation_mail, request, user)
+        await send_activation_mail(
+            f"Account activation for {user.username}",
+            "activation",
+            f"{request.base_url}auth/activate",
+            user,
+        )
         return {"msg": "Activation key sent."}
     except HTTPException as e:
         raise e
@@ -151,7 +207,8 @@ async def change_password(
 ) -> MessageResponseSchema:
     try:
         await update_password(session=session, user_id=user.id, payload=payload)
-        return {"msg": "Password changed."}
+        await revoke_user_sessions(user.id)
+        return {"msg": "Password changed. Please log in again."}
     except HTTPException as e:
         raise e
 
@@ -162,23 +219,19 @@ async def change_password(
     description="Send password reset link to user.",
     response_model=MessageResponseSchema,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(throttle_mail)],
 )
 async def forgot_password(
     request: Request,
-    task_queue: BackgroundTasks,
     email: EmailStr = Depends(email_form_field),
     session: AsyncSession = Depends(get_database_session),
 ) -> MessageResponseSchema:
     try:
         user = await read_user_by_email(session=session, email=email)
-        url = create_temporary_activation_url(user, f"{request.base_url}auth/password/reset")
-
-        task_queue.add_task(
-            send_activation_mail,
-            request,
+        await send_activation_mail(
             f"Password reset requested by {user.username}",
             "password-reset",
-            url,
+            f"{request.base_url}auth/password/reset",
             user,
         )
 
@@ -201,7 +254,7 @@ async def validate_password_reset_link(
     ),
 ):
     try:
-        if not validate_key(key=validation_key):
+        if not await check_one_time_token(validation_key, purpose="password-reset"):
             raise_410_gone(message="Link expired!")
     except HTTPException as e:
         raise e
@@ -220,12 +273,13 @@ async def reset_user_password(
     session: AsyncSession = Depends(get_database_session),
 ):
     try:
-        user = pop_from_cache(key=validation_key)
+        user = await consume_one_time_token(validation_key, purpose="password-reset")
         await reset_password(
             session=session,
-            account_id=user["account_id"],
+            user_id=user["id"],
             new_password=new_password,
         )
+        await revoke_user_sessions(user["id"])
         return MessageResponseSchema(msg="Password was reset successfully!")
     except HTTPException as e:
         raise e
@@ -240,24 +294,16 @@ async def reset_user_password(
 )
 async def request_email_change(
     request: Request,
-    task_queue: BackgroundTasks,
     user: TokenUser = Depends(authenticate_active_user),
     new_email: EmailStr = Depends(email_form_field),
 ) -> MessageResponseSchema:
     try:
-        url = create_temporary_activation_url(
-            user,
-            f"{request.base_url}auth/update/email",
-            extras={"new_email": new_email},
-        )
-
-        task_queue.add_task(
-            send_activation_mail,
-            request,
+        await send_activation_mail(
             f"Change email requested by {user.username}",
             "change-email",
-            url,
+            f"{request.base_url}auth/update/email",
             user,
+            extras={"new_email": new_email},
         )
 
         return {"msg": "Please check your email for the temporary email change link."}
@@ -273,7 +319,7 @@ async def request_email_change(
 )
 async def validate_email_change_link(validation_key: str = Depends(temporary_url_key)):
     try:
-        if not validate_key(key=validation_key):
+        if not await check_one_time_token(validation_key, purpose="change-email"):
             raise_410_gone(message="Link expired!")
     except HTTPException as e:
         raise e
@@ -291,10 +337,10 @@ async def change_user_email(
     session: AsyncSession = Depends(get_database_session),
 ):
     try:
-        user = pop_from_cache(key=validation_key)
+        user = await consume_one_time_token(validation_key, purpose="change-email")
         await update_email(
             session=session,
-            account_id=user["account_id"],
+            user_id=user["id"],
             new_email=user["new_email"],
         )
         return MessageResponseSchema(msg="Email was changed successfully!")
@@ -1,33 +1,119 @@
-from typing import List
+from typing import List, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 
+from server.config.factory import settings
+from server.database.autocomplete import product_autocomplete
 from server.database.products.crud import (
+    attach_shop_details,
     create_product,
     delete_product_by_id,
+    delete_products_in_bulk,
+    import_products,
     read_product_by_id,
     read_products,
+    search_products,
     update_product_by_id,
+    update_products_in_bulk,
+)
+from server.schemas.inc.products import (
+    ProductBulkDeleteRequest,
+    ProductBulkUpdateRequest,
+    ProductRequest,
+    ProductSearchQuery,
+    ProductUpdateRequest,
 )
-from server.schemas.inc.products import ProductRequest, ProductUpdateRequest
 from server.schemas.out.auth import TokenUser
-from server.schemas.out.products import ProductResponse
-from server.security.dependencies import authenticate_active_user
+from server.schemas.out.products import (
+    NameSuggestion,
+    ProductBulkWriteResponse,
+    ProductImportResponse,
+    ProductResponse,
+    ProductSearchResponse,
+)
+from server.security.dependencies import (
+    authenticate_active_user,
+    product_search_query,
+    sparse_fieldset,
+)
 from server.utils.enums import Tags
+from server.utils.fieldsets import extend_fieldset, narrow_model
 from server.utils.messages import raise_400_bad_request
+from server.utils.responses import model_response
+from server.utils.streams import read_lines
 
 router = APIRouter(prefix="/products", tags=[Tags.products])
 
 
+@router.get(
+    "/autocomplete",
+    summary="Autocomplete product names",
+    description="Suggest the most viewed products whose name, or a word in it, starts with the given prefix.",
+    response_model=List[NameSuggestion],
+)
+async def autocomplete_product_names(
+    q: str = Query(..., min_length=1, max_length=100, title="Prefix", description="Prefix typed so far"),
+    limit: int = Query(
+        default=settings.AUTOCOMPLETE_TOP_K,
+        ge=1,
+        le=settings.AUTOCOMPLETE_TOP_K,
+        title="Suggestions",
+        description="Maximum number of suggestions",
+    ),
+):
+    suggestions = product_autocomplete.suggest(q, limit)
+    return model_response([{"id": key, "name": name} for key, name in suggestions], NameSuggestion)
+
+
+@router.get(
+    "/search",
+    summary="Search products",
+    description=(
+        "Search products by name with optional price, brand, color, size and rating filters. "
+        "Facet counts are computed over all matching products. Pass the X-Next-Cursor response header back "
+        "as `cursor` to fetch the next page."
+    ),
+    response_model=ProductSearchResponse,
+)
+async def search_product_catalog(
+    query: ProductSearchQuery = Depends(product_search_query),
+    page: int = Query(1, ge=1),
+    cursor: Union[str, None] = Query(default=None, title="Cursor", description="Opaque cursor of the next page"),
+    limit: int = Query(
+        default=settings.PAGINATION_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.PAGINATION_MAX_LIMIT,
+        title="Page size",
+        description="Number of products per page",
+    ),
+):
+    try:
+        result, next_cursor = await search_products(query, page, limit, cursor)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return model_response(result, ProductSearchResponse, headers=headers)
+    except HTTPException as e:
+        raise e
+
+
 @router.get(
     "/{product_id}",
     summary="Get a single product",
     description="Get a single product by its ID",
     response_model=ProductResponse,
 )
-async def read_single_product(product_id: str):
+async def read_single_product(
+    product_id: str,
+    include_shop: bool = Query(default=False, title="Include shop", description="Include full shop details"),
+    fields: Union[Tuple[str, ...], None] = Depends(sparse_fieldset(ProductResponse)),
+    cache_control: Union[str, None] = Header(default=None, description="Send `no-cache` to bypass the product cache"),
+):
     try:
-        return await read_product_by_id(product_id)
+        product = await read_product_by_id(product_id, use_cache="no-cache" not in (cache_control or ""))
+        product_autocomplete.hit(product_id)
+        if include_shop:
+            product = (await attach_shop_details([product]))[0]
+            fields = extend_fieldset(fields, "shop_details")
+        return model_response(product, narrow_model(ProductResponse, fields))
     except HTTPException as e:
         raise e
 
@@ -35,12 +121,37 @@ async def read_single_product(product_id: str):
 @router.get(
     "",
     summary="Get multiple products",
-    description="Get all products with pagination.",
+    description=(
+        "Get all products with pagination. Pass the X-Next-Cursor response header back as `cursor` "
+        "to fetch the next page in constant time regardless of depth."
+    ),
     response_model=List[ProductResponse],
 )
-async def paginate_products(page: int = Query(1, ge=1)):
+async def paginate_products(
+    page: int = Query(1, ge=1),
+    cursor: Union[str, None] = Query(default=None, title="Cursor", description="Opaque cursor of the next page"),
+    limit: int = Query(
+        default=settings.PAGINATION_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.PAGINATION_MAX_LIMIT,
+        title="Page size",
+        description="Number of products per page",
+    ),
+    include_shop: bool = Query(default=False, title="Include shop", description="Include full shop details"),
+    fields: Union[Tuple[str, ...], None] = Depends(sparse_fieldset(ProductResponse)),
+):
     try:
-        return await read_products(page)
+        products, next_cursor = await read_products(
+            page,
+            limit,
+            cursor,
+            extend_fieldset(fields, "shop") if include_shop else fields,
+        )
+        if include_shop:
+            products = await attach_shop_details(products)
+            fields = extend_fieldset(fields, "shop_details")
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return model_response(products, narrow_model(ProductResponse, fields), headers=headers)
     except HTTPException as e:
         raise e
 
@@ -62,17 +173,84 @@ async def create_single_product(
         raise e
 
 
+@router.post(
+    "/bulk",
+    summary="Import products in bulk",
+    description="Import products from a newline-delimited JSON stream with one product per line.",
+    response_model=ProductImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string", "format": "binary"}}},
+        },
+    },
+)
+async def import_product_stream(
+    request: Request,
+    user: TokenUser = Depends(authenticate_active_user),
+):
+    try:
+        return await import_products(
+            read_lines(request.stream(), settings.PRODUCT_IMPORT_MAX_LINE_SIZE),
+            user.id,
+            settings.PRODUCT_IMPORT_BATCH_SIZE,
+        )
+    except HTTPException as e:
+        raise e
+
+
+@router.patch(
+    "/bulk",
+    summary="Update products in bulk",
+    description="Update many products of the caller's shops, either per product ID or for whole shops.",
+    response_model=ProductBulkWriteResponse,
+)
+async def update_product_batch(
+    payload: ProductBulkUpdateRequest,
+    user: TokenUser = Depends(authenticate_active_user),
+):
+    try:
+        return await update_products_in_bulk(payload, user.id)
+    except HTTPException as e:
+        raise e
+
+
+@router.delete(
+    "/bulk",
+    summary="Delete products in bulk",
+    description="Delete many products of the caller's shops, either by product ID or for whole shops.",
+    response_model=ProductBulkWriteResponse,
+)
+async def delete_product_batch(
+    payload: ProductBulkDeleteRequest,
+    user: TokenUser = Depends(authenticate_active_user),
+):
+    try:
+        return await delete_products_in_bulk(payload, user.id)
+    except HTTPException as e:
+        raise e
+
+
 @router.patch(
     "/{product_id}",
     summary="Update a single product",
     description="Update a single product by its ID",
     response_model=ProductResponse,
 )
-async def update_single_product(product_id: str, product: ProductUpdateRequest):
+async def update_single_product(
+    product_id: str,
+    product: ProductUpdateRequest,
+    version: Union[int, None] = Query(
+        default=None,
+        ge=0,
+        title="Expected version",
+        description="Only apply the update if the product is still at this version",
+    ),
+):
     try:
         if not product.dict(exclude_unset=True):
             raise_400_bad_request("No fields to update.")
-        return await update_product_by_id(product_id, product)
+        return await update_product_by_id(product_id, product, version)
     except HTTPException as e:
         raise e
 
@@ -1,7 +1,9 @@
-from typing import List, Union
+from typing import List, Tuple, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from server.config.factory import settings
+from server.database.autocomplete import shop_autocomplete
 from server.database.shops.crud import (
     create_shop,
     delete_shop,
@@ -12,9 +14,11 @@ from server.database.shops.crud import (
 )
 from server.schemas.inc.products import ShopRequest, ShopUpdateRequest
 from server.schemas.out.auth import TokenUser
-from server.schemas.out.products import ShopResponse
-from server.security.dependencies import authenticate_active_user
+from server.schemas.out.products import NameSuggestion, ShopResponse
+from server.security.dependencies import authenticate_active_user, sparse_fieldset
 from server.utils.enums import Tags
+from server.utils.fieldsets import narrow_model
+from server.utils.responses import model_response
 
 router = APIRouter(prefix="/shops", tags=[Tags.shops])
 
@@ -22,19 +26,51 @@ router = APIRouter(prefix="/shops", tags=[Tags.shops])
 @router.get(
     "/me",
     summary="Get own shop",
-    description="Get own shop information",
+    description="Get own shop information. Pass the X-Next-Cursor response header back as `cursor` to continue.",
     response_model=List[ShopResponse],
 )
 async def read_personal_shop(
     page: int = Query(default=1, ge=1, title="Page number", description="Page number"),
+    cursor: Union[str, None] = Query(default=None, title="Cursor", description="Opaque cursor of the next page"),
+    limit: int = Query(
+        default=settings.PAGINATION_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.PAGINATION_MAX_LIMIT,
+        title="Page size",
+        description="Number of shops per page",
+    ),
+    fields: Union[Tuple[str, ...], None] = Depends(sparse_fieldset(ShopResponse)),
     user: TokenUser = Depends(authenticate_active_user),
 ) -> ShopResponse:
     try:
-        return await read_shop_by_owner(user.id, page)
+        shops, next_cursor = await read_shop_by_owner(user.id, page, limit, cursor, fields)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return model_response(shops, narrow_model(ShopResponse, fields), headers=headers)
     except HTTPException as e:
         raise e
 
 
+@router.get(
+    "/autocomplete",
+    summary="Autocomplete shop names",
+    description="Suggest the most viewed shops whose name, or a word in it, starts with the given prefix.",
+    response_model=List[NameSuggestion],
+    dependencies=[Depends(authenticate_active_user)],
+)
+async def autocomplete_shop_names(
+    q: str = Query(..., min_length=1, max_length=100, title="Prefix", description="Prefix typed so far"),
+    limit: int = Query(
+        default=settings.AUTOCOMPLETE_TOP_K,
+        ge=1,
+        le=settings.AUTOCOMPLETE_TOP_K,
+        title="Suggestions",
+        description="Maximum number of suggestions",
+    ),
+):
+    suggestions = shop_autocomplete.suggest(q, limit)
+    return model_response([{"id": key, "name": name} for key, name in suggestions], NameSuggestion)
+
+
 @router.get(
     "/{shop_id}",
     summary="Get shop by id",
@@ -42,9 +78,14 @@ async def read_personal_shop(
     response_model=ShopResponse,
     dependencies=[Depends(authenticate_active_user)],
 )
-async def read_single_shop(shop_id: str) -> ShopResponse:
+async def read_single_shop(
+    shop_id: str,
+    fields: Union[Tuple[str, ...], None] = Depends(sparse_fieldset(ShopResponse)),
+) -> ShopResponse:
     try:
-        return await read_shop_by_id(shop_id)
+        shop = await read_shop_by_id(shop_id, fields)
+        shop_autocomplete.hit(shop_id)
+        return model_response(shop, narrow_model(ShopResponse, fields))
     except HTTPException as e:
         raise e
 
@@ -52,16 +93,27 @@ async def read_single_shop(shop_id: str) -> ShopResponse:
 @router.get(
     "",
     summary="Search shops",
-    description="Search shops",
+    description="Search shops. Pass the X-Next-Cursor response header back as `cursor` to continue.",
     response_model=List[ShopResponse],
     dependencies=[Depends(authenticate_active_user)],
 )
 async def search_shops(
     name: Union[str, None] = Query(default=None, title="Search query", description="Search query"),
     page: int = Query(default=1, ge=1, title="Page number", description="Page number"),
+    cursor: Union[str, None] = Query(default=None, title="Cursor", description="Opaque cursor of the next page"),
+    limit: int = Query(
+        default=settings.PAGINATION_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.PAGINATION_MAX_LIMIT,
+        title="Page size",
+        description="Number of shops per page",
+    ),
+    fields: Union[Tuple[str, ...], None] = Depends(sparse_fieldset(ShopResponse)),
 ) -> List[ShopResponse]:
     try:
-        return await search_shops_by_name(name, page)
+        shops, next_cursor = await search_shops_by_name(name, page, limit, cursor, fields)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return model_response(shops, narrow_model(ShopResponse, fields), headers=headers)
     except HTTPException as e:
         raise e
 
@@ -92,10 +144,16 @@ async def create_new_shop(
 async def update_single_shop(
     shop_id: str,
     shop: ShopUpdateRequest,
+    version: Union[int, None] = Query(
+        default=None,
+        ge=0,
+        title="Expected version",
+        description="Only apply the update if the shop is still at this version",
+    ),
     user: TokenUser = Depends(authenticate_active_user),
 ) -> ShopResponse:
     try:
-        return await update_shop(shop_id, user.id, shop)
+        return await update_shop(shop_id, user.id, shop, version)
     except HTTPException as e:
         raise e
 
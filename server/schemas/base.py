@@ -36,6 +36,34 @@ class HealthResponseSchema(BaseAPISchema):
     DEBUG: bool
 
 
+class CacheStatsSchema(BaseAPISchema):
+    local_hits: int
+    redis_hits: int
+    misses: int
+    size: int
+
+
+class AutocompleteStatsSchema(BaseAPISchema):
+    entries: int
+    nodes: int
+
+
+class CacheHealthResponseSchema(BaseAPISchema):
+    products: CacheStatsSchema
+    shop_names: AutocompleteStatsSchema
+    product_names: AutocompleteStatsSchema
+
+
+class PasswordHashingHealthResponseSchema(BaseAPISchema):
+    queued: int
+    running: int
+    concurrency: int
+
+
+class JWKSResponseSchema(BaseModel):
+    keys: List[Dict[str, Any]]
+
+
 class MessageResponseSchema(BaseResponseSchema):
     loc: Union[List[str], None] = None
     msg: str
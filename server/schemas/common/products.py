@@ -1,5 +1,6 @@
 from typing import Dict, List, Union
 
+from beanie import PydanticObjectId
 from pydantic import BaseModel, EmailStr, Field, HttpUrl
 
 
@@ -20,3 +21,8 @@ class ShopBase(BaseModel):
     phone_numbers: Union[List[str], None] = Field(default=None, title="Shop phone numbers")
     emails: Union[List[EmailStr], None] = Field(default=None, title="Shop emails")
     links: Union[Dict[str, HttpUrl], None] = Field(default=None, title="Shop links")
+
+
+class ShopReference(BaseModel):
+    id: PydanticObjectId = Field(..., title="Shop ID")
+    name: str = Field(..., title="Shop name")
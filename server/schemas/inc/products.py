@@ -1,6 +1,6 @@
 from typing import Dict, List, Union
 
-from pydantic import EmailStr, Field, HttpUrl
+from pydantic import BaseModel, EmailStr, Field, HttpUrl, root_validator, validator
 
 from server.schemas.common.products import ProductBase, ShopBase
 
@@ -34,6 +34,12 @@ class ProductUpdateRequest(ProductBase):
     colors: List[str] = Field(default_factory=list, title="Available colors of the product")
     rating: Union[float, None] = Field(default=None, title="Average product rating")
 
+    @validator("name", "brand", "model", "description", "price", pre=True)
+    def validate_required_fields(cls, value):
+        if value is None:
+            raise ValueError("field cannot be null")
+        return value
+
     class Config:
         schema_extra = {
             "example": {
@@ -48,6 +54,53 @@ class ProductUpdateRequest(ProductBase):
         }
 
 
+class ProductBulkUpdateItem(BaseModel):
+    id: str = Field(..., title="Product ID")
+    changes: ProductUpdateRequest = Field(..., title="Fields to update")
+
+
+class ProductBulkUpdateRequest(BaseModel):
+    items: List[ProductBulkUpdateItem] = Field(default_factory=list, title="Per product updates")
+    shop_ids: Union[List[str], None] = Field(default=None, title="Update every product of these shops")
+    changes: Union[ProductUpdateRequest, None] = Field(default=None, title="Fields to update in the shops")
+
+    @root_validator
+    def validate_target(cls, values):
+        if values.get("items") and values.get("shop_ids") is not None:
+            raise ValueError("Provide either items or shop_ids, not both")
+        if not values.get("items") and not (values.get("shop_ids") and values.get("changes")):
+            raise ValueError("Provide items, or shop_ids together with changes")
+        return values
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "items": [
+                    {"id": "5f9d7a9b9b3f4c1e9c3e8e3f", "changes": {"price": 90.0}},
+                    {"id": "5f9d7a9b9b3f4c1e9c3e8e40", "changes": {"price": 120.0}},
+                ],
+            }
+        }
+
+
+class ProductBulkDeleteRequest(BaseModel):
+    ids: Union[List[str], None] = Field(default=None, title="Product IDs")
+    shop_ids: Union[List[str], None] = Field(default=None, title="Delete every product of these shops")
+
+    @root_validator
+    def validate_target(cls, values):
+        if bool(values.get("ids")) == bool(values.get("shop_ids")):
+            raise ValueError("Provide either ids or shop_ids")
+        return values
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "ids": ["5f9d7a9b9b3f4c1e9c3e8e3f", "5f9d7a9b9b3f4c1e9c3e8e40"],
+            }
+        }
+
+
 class ShopRequest(ShopBase):
     class Config:
         schema_extra = {
@@ -73,6 +126,12 @@ class ShopUpdateRequest(ShopBase):
     emails: Union[List[EmailStr], None] = Field(default=None, title="Shop emails")
     links: Union[Dict[str, HttpUrl], None] = Field(default=None, title="Shop links")
 
+    @validator("name", "address", pre=True)
+    def validate_required_fields(cls, value):
+        if value is None:
+            raise ValueError("field cannot be null")
+        return value
+
     class Config:
         schema_extra = {
             "example": {
@@ -88,3 +147,20 @@ class ShopUpdateRequest(ShopBase):
                 },
             },
         }
+
+
+class ProductSearchQuery(BaseModel):
+    text: Union[str, None] = Field(default=None, title="Text to search in product names")
+    min_price: Union[float, None] = Field(default=None, title="Minimum price")
+    max_price: Union[float, None] = Field(default=None, title="Maximum price")
+    brands: List[str] = Field(default_factory=list, title="Brands to include")
+    colors: List[str] = Field(default_factory=list, title="Colors to include")
+    sizes: List[str] = Field(default_factory=list, title="Sizes to include")
+    min_rating: Union[float, None] = Field(default=None, title="Minimum average rating")
+
+    @root_validator
+    def validate_price_range(cls, values):
+        min_price, max_price = values.get("min_price"), values.get("max_price")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price must not be greater than max_price")
+        return values
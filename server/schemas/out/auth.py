@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Union
 
 from pydantic import BaseModel, Field
 
@@ -22,6 +23,15 @@ class TokenData(TokenUser):
         title="OAuth2.0 token subject",
         decription="A string for subject of the token as per OAuth2.0 requirements.",
     )
+    is_active: bool = Field(
+        default=False,
+        title="account activation status",
+        decription="Whether the account was active when the token was issued.",
+    )
+    sid: str = Field(
+        title="session ID",
+        decription="Unique ID of the login session that can be revoked.",
+    )
 
 
 class TokenResponseSchema(BaseModel):
@@ -33,3 +43,8 @@ class TokenResponseSchema(BaseModel):
         title="token type",
         decription="A string for token type as per OAuth2.0 requirements.",
     )
+    refresh_token: Union[str, None] = Field(
+        default=None,
+        title="refresh token",
+        decription="A single use token that can be exchanged for a new access token.",
+    )
@@ -1,10 +1,57 @@
+from typing import List, Union
+
 from server.models.documents.products import ProductDocument, ShopDocument
-from server.schemas.base import BaseResponseSchema
+from server.schemas.base import BaseAPISchema, BaseResponseSchema
 
 
-class ProductResponse(BaseResponseSchema, ProductDocument):
+class ShopResponse(BaseResponseSchema, ShopDocument):
     pass
 
 
-class ShopResponse(BaseResponseSchema, ShopDocument):
-    pass
+class ProductResponse(BaseResponseSchema, ProductDocument):
+    shop_details: Union[ShopResponse, None] = None
+
+
+class ProductImportError(BaseAPISchema):
+    line: int
+    msg: str
+
+
+class ProductImportResponse(BaseAPISchema):
+    inserted: int
+    errors: List[ProductImportError]
+
+
+class ProductBulkWriteResponse(BaseAPISchema):
+    matched: int = 0
+    modified: int = 0
+    deleted: int = 0
+
+
+class NameSuggestion(BaseAPISchema):
+    id: str
+    name: str
+
+
+class FacetCount(BaseAPISchema):
+    value: str
+    count: int
+
+
+class PriceFacet(BaseAPISchema):
+    min: float
+    max: float
+    count: int
+
+
+class ProductSearchFacets(BaseAPISchema):
+    brands: List[FacetCount] = []
+    colors: List[FacetCount] = []
+    sizes: List[FacetCount] = []
+    prices: List[PriceFacet] = []
+
+
+class ProductSearchResponse(BaseAPISchema):
+    total: int
+    items: List[ProductResponse]
+    facets: ProductSearchFacets
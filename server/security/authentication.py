@@ -1,9 +1,33 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Union
+
 from passlib.context import CryptContext
 
+from server.config.factory import settings
+
+
+@lru_cache()
+def get_crypt_context() -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return get_crypt_context().hash(password)
+
+
+def verify_hashed_password(password: str, hashed_password: str) -> bool:
+    return get_crypt_context().verify(password, hashed_password)
+
 
 class PasswordContext:
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = get_crypt_context()
+        self.executor: Union[Executor, None] = None
+        self.semaphore: Union[asyncio.Semaphore, None] = None
+        self.queued: int = 0
+        self.running: int = 0
 
     def hash_plain_password(self, password: str) -> str:
         return self.pwd_context.hash(password)
@@ -11,6 +35,59 @@ class PasswordContext:
     def verify_password(self, password: str, hashed_password: str) -> bool:
         return self.pwd_context.verify(password, hashed_password)
 
+    async def hash_plain_password_async(self, password: str) -> str:
+        return await self.run_in_pool(hash_password, password)
+
+    async def verify_password_async(self, password: str, hashed_password: str) -> bool:
+        return await self.run_in_pool(verify_hashed_password, password, hashed_password)
+
+    def get_executor(self) -> Executor:
+        if self.executor is None:
+            if settings.PASSWORD_HASHING_EXECUTOR == "process":
+                self.executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASHING_WORKERS)
+            elif settings.PASSWORD_HASHING_EXECUTOR == "thread":
+                self.executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    thread_name_prefix="password-hashing",
+                )
+            else:
+                raise ValueError(f"Unsupported password hashing executor: {settings.PASSWORD_HASHING_EXECUTOR}")
+        return self.executor
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(settings.PASSWORD_HASHING_CONCURRENCY)
+        return self.semaphore
+
+    async def run_in_pool(self, func: Callable[..., Any], *args: Any) -> Any:
+        semaphore = self.get_semaphore()
+        self.queued += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.get_executor(), func, *args)
+        finally:
+            self.running -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queued,
+            "running": self.running,
+            "concurrency": settings.PASSWORD_HASHING_CONCURRENCY,
+        }
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        self.executor = None
+        self.semaphore = None
+
 
 def get_password_context() -> PasswordContext:
     return PasswordContext()
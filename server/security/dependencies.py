@@ -1,27 +1,30 @@
-from fastapi import Depends, Form, Query
+from typing import Callable, List, Tuple, Type, Union
+
+from fastapi import Depends, Form, Query, Request
 from fastapi.security import OAuth2PasswordBearer
-from pydantic import EmailStr
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from pydantic import BaseModel, EmailStr, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.config.factory import settings
-from server.database.managers import read_from_cache
+from server.database.managers import get_async_session_factory, read_from_cache
 from server.schemas.inc.auth import (
     LoginRequestSchema,
     PasswordChangeRequestSchema,
     SignupRequestSchema,
 )
+from server.schemas.inc.products import ProductSearchQuery
 from server.schemas.out.auth import TokenUser
-from server.security.token import decode_jwt
+from server.security.revocation import session_denylist
+from server.security.throttling import login_limiter, mail_limiter, signup_limiter
+from server.security.token import decode_jwt, decode_jwt_claims
+from server.utils.fieldsets import parse_fieldset
 from server.utils.messages import raise_401_unauthorized, raise_422_unprocessable_entity
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
 def get_async_database_session() -> AsyncSession:
-    url = settings.RDS_URI
-    engine = create_async_engine(url)
-    SessionLocal = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    SessionLocal = get_async_session_factory()
     return SessionLocal()
 
 
@@ -33,9 +36,21 @@ async def get_database_session() -> AsyncSession:
         await session.close()
 
 
-def is_user_active(token: str = Depends(oauth2_scheme)) -> TokenUser:
-    user = read_from_cache(key=token)
-    if user["is_active"]:
+async def is_user_active(token: str = Depends(oauth2_scheme)) -> TokenUser:
+    if settings.JWT_LOCAL_VERIFICATION:
+        try:
+            claims = decode_jwt_claims(token)
+        except ValueError:
+            raise_401_unauthorized("Invalid token")
+
+        if session_denylist.is_revoked(claims.sid):
+            raise_401_unauthorized("Session revoked")
+        is_active = claims.is_active
+    else:
+        user = await read_from_cache(key=token)
+        is_active = user["is_active"]
+
+    if is_active:
         return token
 
     raise_401_unauthorized("Inactive user")
@@ -59,6 +74,42 @@ def temporary_url_key(
     return validation_key
 
 
+def sparse_fieldset(schema: Type[BaseModel]) -> Callable[..., Union[Tuple[str, ...], None]]:
+    def fieldset(
+        fields: Union[str, None] = Query(
+            default=None,
+            title="Fields",
+            description="Comma separated list of fields to return. The ID is always included.",
+        ),
+    ) -> Union[Tuple[str, ...], None]:
+        return parse_fieldset(schema, fields)
+
+    return fieldset
+
+
+def product_search_query(
+    q: Union[str, None] = Query(default=None, title="Text", description="Text to search in product names"),
+    min_price: Union[float, None] = Query(default=None, ge=0, title="Minimum price"),
+    max_price: Union[float, None] = Query(default=None, ge=0, title="Maximum price"),
+    brand: List[str] = Query(default=[], title="Brands", description="Repeat to match any of several brands"),
+    color: List[str] = Query(default=[], title="Colors", description="Repeat to match any of several colors"),
+    size: List[str] = Query(default=[], title="Sizes", description="Repeat to match any of several sizes"),
+    min_rating: Union[float, None] = Query(default=None, ge=0, title="Minimum rating"),
+) -> ProductSearchQuery:
+    try:
+        return ProductSearchQuery(
+            text=q,
+            min_price=min_price,
+            max_price=max_price,
+            brands=brand,
+            colors=color,
+            sizes=size,
+            min_rating=min_rating,
+        )
+    except ValidationError as e:
+        raise_422_unprocessable_entity("; ".join(error["msg"] for error in e.errors()))
+
+
 def username_form_field(
     username: str = Form(
         title="username",
@@ -70,6 +121,17 @@ def username_form_field(
     return username
 
 
+def refresh_token_form_field(
+    refresh_token: str = Form(
+        alias="refresh_token",
+        title="Refresh token",
+        description="Refresh token issued by the previous login or refresh.",
+        min_length=1,
+    ),
+) -> str:
+    return refresh_token
+
+
 def email_form_field(
     email: EmailStr = Form(
         title="email",
@@ -161,3 +223,28 @@ def password_reset_request_form(
     if new_password != repeat_password:
         raise_422_unprocessable_entity("Passwords do not match.")
     return new_password
+
+
+def client_address(request: Request) -> str:
+    return request.client.host if request.client else ""
+
+
+async def throttle_login(
+    request: Request,
+    username: str = Depends(username_form_field),
+) -> None:
+    await login_limiter.check(f"ip:{client_address(request)}", f"username:{username.lower()}")
+
+
+async def throttle_signup(
+    request: Request,
+    email: EmailStr = Depends(email_form_field),
+) -> None:
+    await signup_limiter.check(f"ip:{client_address(request)}", f"email:{email.lower()}")
+
+
+async def throttle_mail(
+    request: Request,
+    email: EmailStr = Depends(email_form_field),
+) -> None:
+    await mail_limiter.check(f"ip:{client_address(request)}", f"email:{email.lower()}")
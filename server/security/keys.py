@@ -0,0 +1,67 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from jose import jwk
+from jose.backends.base import Key
+
+from server.config.factory import settings
+
+
+def is_asymmetric_algorithm(algorithm: str) -> bool:
+    return not algorithm.startswith("HS")
+
+
+class KeyRing:
+    def __init__(self, algorithm: str, directory: Union[str, None], active_kid: Union[str, None]):
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self.private_keys: Dict[str, str] = {}
+        self.public_keys: Dict[str, Key] = {}
+        self.created_at: Dict[str, float] = {}
+
+        if directory:
+            self.load(Path(directory))
+
+    def load(self, directory: Path):
+        for path in sorted(directory.glob("*.pem")):
+            kid = path.stem
+            pem = path.read_text()
+            self.created_at[kid] = path.stat().st_mtime
+            key = jwk.construct(pem, self.algorithm)
+            if "PRIVATE KEY" in pem:
+                self.private_keys[kid] = pem
+                self.public_keys[kid] = key.public_key()
+            else:
+                self.public_keys[kid] = key
+
+    def signing_key(self) -> Tuple[str, str]:
+        kid = self.active_kid or max(self.private_keys, key=lambda kid: (self.created_at[kid], kid), default=None)
+        if kid not in self.private_keys:
+            raise ValueError(f"no private key available for kid {kid}")
+        return kid, self.private_keys[kid]
+
+    def verification_key(self, kid: Union[str, None]) -> Key:
+        if kid not in self.public_keys:
+            raise ValueError(f"unknown kid {kid}")
+        return self.public_keys[kid]
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            "keys": [
+                {**key.to_dict(), "kid": kid, "use": "sig", "alg": self.algorithm}
+                for kid, key in sorted(self.public_keys.items())
+            ],
+        }
+
+
+@lru_cache()
+def get_key_ring() -> KeyRing:
+    if not is_asymmetric_algorithm(settings.JWT_ALGORITHM):
+        return KeyRing(algorithm=settings.JWT_ALGORITHM, directory=None, active_kid=None)
+
+    return KeyRing(
+        algorithm=settings.JWT_ALGORITHM,
+        directory=settings.JWT_KEYS_DIRECTORY,
+        active_kid=settings.JWT_ACTIVE_KID,
+    )
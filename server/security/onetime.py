@@ -0,0 +1,80 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from typing import Any, Dict, Union
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from server.config.factory import settings
+from server.database.managers import get_redis_client
+from server.utils.messages import raise_410_gone
+
+
+def get_token_ttl(purpose: str) -> int:
+    ttls = {
+        "activation": settings.ACTIVATION_TOKEN_TTL,
+        "password-reset": settings.PASSWORD_RESET_TOKEN_TTL,
+        "change-email": settings.EMAIL_CHANGE_TOKEN_TTL,
+    }
+    if purpose not in ttls:
+        raise ValueError(f"Unsupported one-time token purpose: {purpose}")
+    return ttls[purpose]
+
+
+def one_time_token_key(purpose: str, nonce: str) -> str:
+    return f"one-time:{purpose}:{nonce}"
+
+
+def sign_one_time_token(purpose: str, nonce: str, expires_at: str) -> str:
+    digest = hmac.new(
+        settings.JWT_SECRET_KEY.encode("utf-8"),
+        f"{purpose}:{nonce}:{expires_at}".encode("utf-8"),
+        hashlib.sha256,
+    ).digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b"=").decode("utf-8")
+
+
+def parse_one_time_token(token: str, purpose: str) -> Union[str, None]:
+    try:
+        nonce, expires_at, signature = token.split(".")
+        expired = int(expires_at, 16) < time.time()
+    except ValueError:
+        return None
+
+    if expired or not hmac.compare_digest(signature, sign_one_time_token(purpose, nonce, expires_at)):
+        return None
+    return one_time_token_key(purpose, nonce)
+
+
+def issue_one_time_token(pipe: Pipeline, purpose: str, data: Dict[str, Any]) -> str:
+    ttl = get_token_ttl(purpose)
+    nonce = secrets.token_urlsafe(16)
+    expires_at = format(int(time.time()) + ttl, "x")
+
+    pipe.set(one_time_token_key(purpose, nonce), json.dumps(data), ex=ttl)
+    return f"{nonce}.{expires_at}.{sign_one_time_token(purpose, nonce, expires_at)}"
+
+
+async def check_one_time_token(token: str, purpose: str) -> bool:
+    key = parse_one_time_token(token, purpose)
+    if key is None:
+        return False
+
+    client: Redis = get_redis_client()
+    return bool(await client.exists(key))
+
+
+async def consume_one_time_token(token: str, purpose: str) -> Dict[str, Any]:
+    key = parse_one_time_token(token, purpose)
+    if key is None:
+        raise_410_gone(message="Link expired!")
+
+    client: Redis = get_redis_client()
+    data = await client.getdel(key)
+    if data is None:
+        raise_410_gone(message="Link expired!")
+    return json.loads(data.decode("utf-8"))
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from contextlib import suppress
+from datetime import datetime
+from typing import Set, Union
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from server.config.factory import settings
+from server.database.managers import get_redis_client
+
+
+class SessionDenylist:
+    def __init__(self, key: str, interval: float):
+        self.key = key
+        self.interval = interval
+        self.sessions: Set[str] = set()
+        self.task: Union[asyncio.Task, None] = None
+
+    def is_revoked(self, session_id: str) -> bool:
+        return session_id in self.sessions
+
+    async def revoke(self, session_id: str, expires_at: datetime):
+        client: Redis = get_redis_client()
+        await client.zadd(self.key, {session_id: expires_at.timestamp()})
+        self.sessions.add(session_id)
+
+    async def sync(self):
+        client: Redis = get_redis_client()
+        await client.zremrangebyscore(self.key, "-inf", time.time())
+        members = await client.zrange(self.key, 0, -1)
+        self.sessions = {member.decode("utf-8") for member in members}
+
+    async def run(self):
+        while True:
+            try:
+                await self.sync()
+            except RedisError as e:
+                print(f"Failed to sync revoked sessions: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        await self.sync()
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+
+
+session_denylist = SessionDenylist(key="revoked-sessions", interval=settings.SESSION_DENYLIST_SYNC_INTERVAL)
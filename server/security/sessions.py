@@ -0,0 +1,103 @@
+import hashlib
+import json
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple, Union
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from server.config.factory import settings
+from server.database.managers import get_redis_client
+from server.models.schemas.users import UserAccount
+from server.security.revocation import session_denylist
+from server.utils.messages import raise_401_unauthorized
+
+CLAIM_REFRESH_TOKEN_SCRIPT = """
+local record = redis.call("GET", KEYS[1])
+if not record then
+    return false
+end
+
+redis.call("DEL", KEYS[1])
+redis.call("SET", KEYS[2], record, "EX", ARGV[1])
+return record
+"""
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def user_sessions_key(user_id: int) -> str:
+    return f"refresh-sessions:{user_id}"
+
+
+def refresh_token_ttl() -> int:
+    return settings.JWT_DAY * 24 * 60 * 60
+
+
+async def issue_refresh_token(user_id: int, family: Union[str, None] = None) -> Tuple[str, str]:
+    token = secrets.token_urlsafe(32)
+    token_hash = hash_refresh_token(token)
+    family = family or uuid4().hex
+    ttl = refresh_token_ttl()
+
+    client: Redis = get_redis_client()
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.set(f"refresh:{token_hash}", json.dumps({"user_id": user_id, "family": family}), ex=ttl)
+        pipe.set(f"refresh-family:{family}", token_hash, ex=ttl)
+        pipe.sadd(user_sessions_key(user_id), family)
+        pipe.expire(user_sessions_key(user_id), ttl)
+        await pipe.execute()
+    return token, family
+
+
+async def create_refresh_token(user: UserAccount) -> Tuple[str, str]:
+    return await issue_refresh_token(user.id)
+
+
+async def rotate_refresh_token(token: str) -> Tuple[int, str, str]:
+    client: Redis = get_redis_client()
+    token_hash = hash_refresh_token(token)
+
+    claim = client.register_script(CLAIM_REFRESH_TOKEN_SCRIPT)
+    record = await claim(keys=[f"refresh:{token_hash}", f"refresh-used:{token_hash}"], args=[refresh_token_ttl()])
+    if record is None:
+        used = await client.get(f"refresh-used:{token_hash}")
+        if used is not None:
+            used = json.loads(used.decode("utf-8"))
+            await revoke_sessions(used["user_id"], used["family"])
+        raise_401_unauthorized("Invalid refresh token")
+
+    data = json.loads(record.decode("utf-8"))
+    current_token_hash = await client.get(f"refresh-family:{data['family']}")
+    if "user_id" not in data or current_token_hash is None or current_token_hash.decode("utf-8") != token_hash:
+        raise_401_unauthorized("Invalid refresh token")
+
+    user_id = data["user_id"]
+    new_token, family = await issue_refresh_token(user_id, family=data["family"])
+    return user_id, family, new_token
+
+
+async def revoke_sessions(user_id: int, *families: str):
+    if not families:
+        return
+
+    client: Redis = get_redis_client()
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.delete(*[f"refresh-family:{family}" for family in families])
+        pipe.srem(user_sessions_key(user_id), *families)
+        await pipe.execute()
+
+    if settings.JWT_LOCAL_VERIFICATION:
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_MIN)
+        for family in families:
+            await session_denylist.revoke(family, expires_at)
+
+
+async def revoke_user_sessions(user_id: int) -> List[str]:
+    client: Redis = get_redis_client()
+    families = [family.decode("utf-8") for family in await client.smembers(user_sessions_key(user_id))]
+    await revoke_sessions(user_id, *families)
+    return families
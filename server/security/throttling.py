@@ -0,0 +1,87 @@
+import math
+import time
+from typing import List
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from server.config.factory import settings
+from server.database.managers import get_redis_client
+from server.utils.caches import LocalCache
+from server.utils.messages import raise_429_too_many_requests
+
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local retry_after = 0
+
+for _, key in ipairs(KEYS) do
+    redis.call("ZREMRANGEBYSCORE", key, "-inf", now - window)
+    if redis.call("ZCARD", key) >= limit then
+        local oldest = redis.call("ZRANGE", key, 0, 0, "WITHSCORES")
+        retry_after = math.max(retry_after, tonumber(oldest[2]) + window - now)
+    end
+end
+
+if retry_after > 0 then
+    return retry_after
+end
+
+for _, key in ipairs(KEYS) do
+    redis.call("ZADD", key, now, ARGV[4])
+    redis.call("PEXPIRE", key, window)
+end
+return 0
+"""
+
+
+class RateLimiter:
+    def __init__(self, name: str, limit: int, window: int):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.local = LocalCache(max_size=settings.RATE_LIMIT_LOCAL_SIZE, ttl=window)
+
+    def cache_key(self, identity: str) -> str:
+        return f"rate-limit:{self.name}:{identity}"
+
+    async def hit_redis(self, keys: List[str], now: int) -> int:
+        client: Redis = get_redis_client()
+        script = client.register_script(SLIDING_WINDOW_SCRIPT)
+        return await script(keys=keys, args=[now, self.window * 1000, self.limit, uuid4().hex])
+
+    def hit_local(self, keys: List[str], now: int) -> int:
+        window = self.window * 1000
+        hits = {key: [hit for hit in self.local.get(key) or [] if hit > now - window] for key in keys}
+
+        retry_after = max((hits[key][0] + window - now for key in keys if len(hits[key]) >= self.limit), default=0)
+        for key in keys:
+            if not retry_after:
+                hits[key].append(now)
+            self.local.set(key, hits[key])
+        return retry_after
+
+    async def hit(self, *identities: str) -> float:
+        keys = [self.cache_key(identity) for identity in identities if identity]
+        now = int(time.time() * 1000)
+
+        try:
+            retry_after = await self.hit_redis(keys, now)
+        except RedisError:
+            retry_after = self.hit_local(keys, now)
+        return retry_after / 1000
+
+    async def check(self, *identities: str) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        retry_after = await self.hit(*identities)
+        if retry_after > 0:
+            raise_429_too_many_requests(retry_after=math.ceil(retry_after))
+
+
+login_limiter = RateLimiter("login", limit=settings.LOGIN_RATE_LIMIT, window=settings.LOGIN_RATE_LIMIT_WINDOW)
+signup_limiter = RateLimiter("signup", limit=settings.SIGNUP_RATE_LIMIT, window=settings.SIGNUP_RATE_LIMIT_WINDOW)
+mail_limiter = RateLimiter("mail", limit=settings.MAIL_RATE_LIMIT, window=settings.MAIL_RATE_LIMIT_WINDOW)
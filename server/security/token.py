@@ -1,5 +1,8 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Union
+from uuid import uuid4
 
 from jose import JWTError, jwt
 from pydantic import ValidationError
@@ -7,12 +10,25 @@ from pydantic import ValidationError
 from server.config.factory import settings
 from server.models.schemas.users import UserAccount
 from server.schemas.out.auth import TokenData, TokenUser
+from server.security.keys import get_key_ring, is_asymmetric_algorithm
+from server.utils.caches import LocalCache
 
+claims_cache = LocalCache(max_size=settings.JWT_CLAIMS_CACHE_SIZE, ttl=settings.JWT_MIN * 60)
 
-def create_jwt(data: UserAccount, expires_delta: Union[datetime, None] = None) -> str:
+
+def create_jwt(
+    data: UserAccount,
+    expires_delta: Union[datetime, None] = None,
+    session_id: Union[str, None] = None,
+) -> str:
     expires_delta = expires_delta if expires_delta else timedelta(minutes=settings.JWT_MIN)
     expire = datetime.utcnow() + expires_delta
-    to_encode = TokenData(**data.dict(), exp=expire, sub=settings.JWT_SUBJECT)
+    to_encode = TokenData(**data.dict(), exp=expire, sub=settings.JWT_SUBJECT, sid=session_id or uuid4().hex)
+
+    if is_asymmetric_algorithm(settings.JWT_ALGORITHM):
+        kid, key = get_key_ring().signing_key()
+        return jwt.encode(to_encode.dict(), key=key, algorithm=settings.JWT_ALGORITHM, headers={"kid": kid})
+
     return jwt.encode(
         to_encode.dict(),
         key=settings.JWT_SECRET_KEY,
@@ -20,20 +36,38 @@ def create_jwt(data: UserAccount, expires_delta: Union[datetime, None] = None) -
     )
 
 
-def decode_jwt(token: str) -> TokenUser:
+def resolve_verification_key(token: str):
+    if not is_asymmetric_algorithm(settings.JWT_ALGORITHM):
+        return settings.JWT_SECRET_KEY
+
+    try:
+        return get_key_ring().verification_key(jwt.get_unverified_header(token).get("kid"))
+    except JWTError as token_decode_error:
+        raise ValueError("unable to decode JWT") from token_decode_error
+
+
+def decode_jwt_claims(token: str) -> TokenData:
+    token_hash = hashlib.sha256(token.encode("utf-8")).digest()
+    claims: Union[TokenData, None] = claims_cache.get(token_hash)
+    if claims is not None:
+        return claims
+
     try:
         payload = jwt.decode(
             token=token,
-            key=settings.JWT_SECRET_KEY,
+            key=resolve_verification_key(token),
             algorithms=[settings.JWT_ALGORITHM],
         )
-        user_data = TokenUser(
-            id=payload.get("id"),
-            username=payload.get("username"),
-            email=payload.get("email"),
-        )
+        claims = TokenData(**payload)
     except JWTError as token_decode_error:
         raise ValueError("unable to decode JWT") from token_decode_error
     except ValidationError as validation_error:
         raise ValueError("invalid payload in JWT") from validation_error
-    return user_data
+
+    claims_cache.set(token_hash, claims, ttl=claims.exp.timestamp() - time.time())
+    return claims
+
+
+def decode_jwt(token: str) -> TokenUser:
+    claims = decode_jwt_claims(token)
+    return TokenUser(id=claims.id, username=claims.username, email=claims.email)
@@ -0,0 +1,171 @@
+import heapq
+import itertools
+import re
+import unicodedata
+from typing import Dict, List, Set, Tuple, Union
+
+SuggestionRank = Tuple[int, str, str]
+
+
+def normalize_name(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", stripped))
+
+
+class PrefixNode:
+    __slots__ = ("children", "keys", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "PrefixNode"] = {}
+        self.keys: Set[str] = set()
+        self.top: List[str] = []
+
+
+class PrefixIndex:
+    def __init__(self, max_entries: int, max_prefix_length: int, top_k: int, max_terms: int = 4):
+        self.max_entries = max_entries
+        self.max_prefix_length = max_prefix_length
+        self.top_k = top_k
+        self.max_terms = max_terms
+        self.root = PrefixNode()
+        self.names: Dict[str, str] = {}
+        self.terms: Dict[str, Tuple[str, ...]] = {}
+        self.scores: Dict[str, int] = {}
+        self.heap: List[Tuple[int, int, str]] = []
+        self.counter = itertools.count()
+        self.node_count: int = 0
+
+    def rank(self, key: str) -> SuggestionRank:
+        return -self.scores.get(key, 0), self.names[key], key
+
+    def index_terms(self, name: str) -> Tuple[str, ...]:
+        words = normalize_name(name).split(" ")
+        terms = {" ".join(words[i:])[: self.max_prefix_length] for i in range(min(len(words), self.max_terms))}
+        return tuple(term for term in terms if term)
+
+    def walk(self, term: str, create: bool = False) -> List[PrefixNode]:
+        path, node = [], self.root
+        for char in term:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return []
+                child = node.children[char] = PrefixNode()
+                self.node_count += 1
+            path.append(child)
+            node = child
+        return path
+
+    def promote(self, node: PrefixNode, key: str):
+        if key not in node.top:
+            if len(node.top) >= self.top_k and self.rank(key) > self.rank(node.top[-1]):
+                return
+            node.top.append(key)
+        node.top.sort(key=self.rank)
+        del node.top[self.top_k :]
+
+    def recompute(self, node: PrefixNode):
+        candidates = set(node.keys)
+        for child in node.children.values():
+            candidates.update(child.top)
+        node.top = heapq.nsmallest(self.top_k, candidates, key=self.rank)
+
+    def push(self, key: str):
+        heapq.heappush(self.heap, (self.scores.get(key, 0), next(self.counter), key))
+        if len(self.heap) > 2 * self.max_entries:
+            self.heap = [(self.scores.get(key, 0), next(self.counter), key) for key in self.names]
+            heapq.heapify(self.heap)
+
+    def evict(self, score: int) -> bool:
+        while self.heap:
+            lowest, _, key = self.heap[0]
+            if key not in self.names or lowest != self.scores.get(key, 0):
+                heapq.heappop(self.heap)
+                continue
+            if lowest > score:
+                return False
+            heapq.heappop(self.heap)
+            self.remove(key)
+            return True
+        return False
+
+    def add(self, key: str, name: str):
+        if self.names.get(key) == name:
+            return
+        if key in self.names:
+            self.remove(key, forget=False)
+        elif len(self.names) >= self.max_entries and not self.evict(self.scores.get(key, 0)):
+            return
+
+        terms = self.index_terms(name)
+        if not terms:
+            return
+
+        self.names[key] = name
+        self.terms[key] = terms
+        for term in terms:
+            path = self.walk(term, create=True)
+            path[-1].keys.add(key)
+            for node in path:
+                self.promote(node, key)
+        self.push(key)
+
+    def remove(self, key: str, forget: bool = True):
+        terms = self.terms.pop(key, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            path = self.walk(term)
+            path[-1].keys.discard(key)
+            for depth in range(len(path) - 1, -1, -1):
+                node = path[depth]
+                if not node.keys and not node.children:
+                    parent = path[depth - 1] if depth else self.root
+                    del parent.children[term[depth]]
+                    self.node_count -= 1
+                elif key in node.top:
+                    node.top.remove(key)
+                    self.recompute(node)
+
+        del self.names[key]
+        if forget:
+            self.scores.pop(key, None)
+
+    def hit(self, key: str, count: int = 1):
+        if key not in self.names:
+            return
+
+        self.scores[key] = self.scores.get(key, 0) + count
+        for term in self.terms[key]:
+            for node in self.walk(term):
+                self.promote(node, key)
+        self.push(key)
+
+    def matches(self, key: str, prefix: str) -> bool:
+        words = normalize_name(self.names[key]).split(" ")
+        return any(" ".join(words[i:]).startswith(prefix) for i in range(min(len(words), self.max_terms)))
+
+    def suggest(self, prefix: str, limit: Union[int, None] = None) -> List[Tuple[str, str]]:
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+
+        path = self.walk(prefix[: self.max_prefix_length])
+        if not path:
+            return []
+
+        keys = path[-1].top
+        if len(prefix) > self.max_prefix_length:
+            keys = [key for key in keys if self.matches(key, prefix)]
+        return [(key, self.names[key]) for key in keys[: limit or self.top_k]]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.names), "nodes": self.node_count}
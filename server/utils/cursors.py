@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Tuple, Union
+
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+
+from server.utils.messages import raise_400_bad_request
+
+
+def encode_cursor(**values: Any) -> str:
+    payload = json.dumps(values, default=str, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("utf-8").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(f"{cursor}{padding}").decode("utf-8"))
+        if not isinstance(values, dict):
+            raise ValueError("cursor payload must be an object")
+        return values
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise_400_bad_request("Invalid cursor.")
+
+
+def decode_object_id_cursor(cursor: str, key: str = "id") -> PydanticObjectId:
+    try:
+        return PydanticObjectId(decode_cursor(cursor)[key])
+    except (KeyError, TypeError, InvalidId):
+        raise_400_bad_request("Invalid cursor.")
+
+
+def decode_offset_cursor(cursor: str, key: str = "offset") -> int:
+    try:
+        offset = decode_cursor(cursor)[key]
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("offset must be a non-negative integer")
+        return offset
+    except (KeyError, ValueError):
+        raise_400_bad_request("Invalid cursor.")
+
+
+def split_page(items: List[Any], limit: int, *keys: str) -> Tuple[List[Any], Union[str, None]]:
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last_item = items[-1]
+    return items, encode_cursor(**{key: getattr(last_item, key) for key in keys})
+
+
+def split_page_by_offset(items: List[Any], limit: int, offset: int) -> Tuple[List[Any], Union[str, None]]:
+    if len(items) <= limit:
+        return items, None
+    return items[:limit], encode_cursor(offset=offset + limit)
@@ -1,73 +1,45 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Union
 
-from fastapi import Request
-from fastapi.templating import Jinja2Templates
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
-from pydantic import EmailStr, HttpUrl
+from pydantic import HttpUrl
+from redis.asyncio import Redis
 
-from server.config.smtp import config_smtp_server, config_templates
+from server.config.factory import settings
+from server.database.managers import get_redis_client
 from server.models.schemas.users import UserAccount
-from server.utils.generators import create_temporary_activation_url
-
-
-def build_mail_body(context: Dict[str, Any], template_name: str) -> str:
-    template_server: Jinja2Templates = config_templates()
-    template = template_server.TemplateResponse(
-        name=template_name,
-        context=context,
-    )
-    return template.body.decode("utf-8")
-
-
-def prepare_message(
-    context: Dict[str, Any],
-    recipients: List[EmailStr],
-    subject: str,
-    template_name: str,
-) -> MessageSchema:
-    return MessageSchema(
-        subject=subject,
-        recipients=recipients,
-        body=build_mail_body(context, template_name),
-        subtype=MessageType.html,
-    )
-
-
-async def send_mail(
-    context: Dict[str, Any],
-    recipients: List[EmailStr],
-    subject: str,
-    template_name: str,
-) -> None:
-    smtp_config: ConnectionConfig = config_smtp_server()
-    smtp_agent = FastMail(smtp_config)
-    message: MessageSchema = prepare_message(
-        context=context,
-        recipients=recipients,
-        subject=subject,
-        template_name=template_name,
-    )
-    await smtp_agent.send_message(message)
+from server.schemas.out.auth import TokenUser
+from server.security.onetime import issue_one_time_token
+from server.utils.jobs import add_mail_job
 
 
 async def send_activation_mail(
-    request: Request,
     subject: str,
     template: str,
     url: HttpUrl,
-    user: UserAccount,
+    user: Union[UserAccount, TokenUser],
+    extras: Union[Dict[str, Any], None] = None,
 ) -> None:
-    url = create_temporary_activation_url(user=user, url=url)
-    context = {
-        "request": request,
-        "subject": subject,
-        "url": url,
-        "username": user.username,
-    }
-
-    await send_mail(
-        context=context,
-        recipients=[user.email],
-        subject=subject,
-        template_name=f"{template}.html",
-    )
+    recipients = [user.email]
+    template_name = f"{template}.html"
+
+    client: Redis = get_redis_client()
+    async with client.pipeline(transaction=True) as pipe:
+        token = issue_one_time_token(pipe, purpose=template, data={"id": user.id, **(extras or {})})
+        context = {
+            "subject": subject,
+            "url": f"{url}?validation_key={token}",
+            "username": user.username,
+        }
+
+        if settings.MAIL_JOBS_ENABLED:
+            add_mail_job(pipe, context=context, recipients=recipients, subject=subject, template_name=template_name)
+        await pipe.execute()
+
+    if not settings.MAIL_JOBS_ENABLED:
+        from server.utils.mailer import send_mail
+
+        await send_mail(
+            context=context,
+            recipients=recipients,
+            subject=subject,
+            template_name=template_name,
+        )
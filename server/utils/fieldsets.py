@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Tuple, Type, Union
+
+from pydantic import BaseModel, create_model
+
+from server.utils.messages import raise_400_bad_request
+
+
+def parse_fieldset(schema: Type[BaseModel], fields: Union[str, None]) -> Union[Tuple[str, ...], None]:
+    if not fields:
+        return None
+
+    names = {}
+    for name, field in schema.__fields__.items():
+        if field.field_info.extra.get("hidden") is True:
+            continue
+        names[name] = name
+        names[field.alias] = name
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = sorted(field for field in requested if field not in names)
+    if unknown:
+        raise_400_bad_request(f"Unknown fields: {', '.join(unknown)}")
+
+    selected = {names[field] for field in requested}
+    return tuple(name for name in schema.__fields__ if name in selected or name == "id")
+
+
+def extend_fieldset(fields: Union[Tuple[str, ...], None], *names: str) -> Union[Tuple[str, ...], None]:
+    if fields is None:
+        return None
+    return (*fields, *(name for name in names if name not in fields))
+
+
+@lru_cache(maxsize=256)
+def narrow_model(schema: Type[BaseModel], fields: Union[Tuple[str, ...], None]) -> Type[BaseModel]:
+    if fields is None:
+        return schema
+
+    return create_model(
+        f"{schema.__name__}Fieldset",
+        __config__=schema.__config__,
+        **{name: (schema.__fields__[name].annotation, schema.__fields__[name].field_info) for name in fields},
+    )
@@ -1,11 +1,15 @@
-from datetime import datetime, timezone
+from datetime import datetime
+from functools import lru_cache
 
 from pydash import camel_case
 
 
 def format_datetime_into_isoformat(ts: datetime) -> str:
-    return ts.replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
+    if ts.tzinfo is not None:
+        ts = ts.replace(tzinfo=None)
+    return f"{ts.isoformat()}Z"
 
 
+@lru_cache(maxsize=None)
 def format_dict_key_to_camel_case(key: str) -> str:
     return camel_case(key)
@@ -0,0 +1,48 @@
+import json
+from typing import Any, Dict, List
+
+from pydantic import EmailStr
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from server.config.factory import settings
+from server.database.managers import get_redis_client
+
+
+def dead_letter_stream(stream: str) -> str:
+    return f"{stream}:dead"
+
+
+def add_mail_job(
+    pipe: Pipeline,
+    context: Dict[str, Any],
+    recipients: List[EmailStr],
+    subject: str,
+    template_name: str,
+) -> None:
+    payload = {
+        "context": context,
+        "recipients": recipients,
+        "subject": subject,
+        "template_name": template_name,
+    }
+
+    pipe.xadd(
+        settings.MAIL_JOB_STREAM,
+        {"payload": json.dumps(payload)},
+        maxlen=settings.MAIL_JOB_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+async def enqueue_mail_job(
+    context: Dict[str, Any],
+    recipients: List[EmailStr],
+    subject: str,
+    template_name: str,
+) -> str:
+    client: Redis = get_redis_client()
+    async with client.pipeline(transaction=False) as pipe:
+        add_mail_job(pipe, context=context, recipients=recipients, subject=subject, template_name=template_name)
+        job_id, *_ = await pipe.execute()
+    return job_id.decode("utf-8")
@@ -0,0 +1,211 @@
+import asyncio
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from functools import lru_cache
+from typing import Any, Dict, List, Union
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig, MessageSchema, MessageType
+from pydantic import EmailStr
+
+from server.config.factory import settings
+from server.config.smtp import config_smtp_server
+from server.utils.templates import get_template_renderer
+
+
+def build_mime_message(message: MessageSchema, sender: str) -> EmailMessage:
+    mime_message = EmailMessage()
+    mime_message["Subject"] = message.subject
+    mime_message["From"] = sender
+    mime_message["To"] = ", ".join(message.recipients)
+    if message.cc:
+        mime_message["Cc"] = ", ".join(message.cc)
+    if message.reply_to:
+        mime_message["Reply-To"] = ", ".join(message.reply_to)
+    mime_message["Date"] = formatdate(localtime=True)
+    mime_message["Message-ID"] = make_msgid()
+    for name, value in (message.headers or {}).items():
+        mime_message[name] = value
+
+    subtype = "html" if message.subtype == MessageType.html else "plain"
+    mime_message.set_content(message.body or "", subtype=subtype, charset=message.charset)
+    return mime_message
+
+
+class MailDispatcher:
+    def __init__(
+        self,
+        config: ConnectionConfig,
+        workers: int,
+        queue_size: int,
+        batch_size: int,
+        max_retries: int,
+        retry_backoff: float,
+        idle_timeout: float,
+    ):
+        self.config = config
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+        self.queue: Union[asyncio.Queue, None] = None
+        self.tasks: List[asyncio.Task] = []
+        self.sent: int = 0
+        self.failed: int = 0
+
+    @property
+    def sender(self) -> str:
+        if self.config.MAIL_FROM_NAME is not None:
+            return f"{self.config.MAIL_FROM_NAME} <{self.config.MAIL_FROM}>"
+        return self.config.MAIL_FROM
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.tasks = [asyncio.create_task(self.work()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10):
+        if self.queue is not None:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                print(f"Dropping {self.queue.qsize()} unsent mails!")
+
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.queue = None
+
+    async def enqueue(self, message: MessageSchema):
+        if self.queue is None:
+            client = await self.deliver(None, message)
+            await self.disconnect(client)
+            return
+
+        await self.queue.put(message)
+
+    async def connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+        )
+        await client.connect()
+        if self.config.USE_CREDENTIALS:
+            await client.login(self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD)
+        return client
+
+    async def disconnect(self, client: Union[aiosmtplib.SMTP, None]) -> None:
+        if client is None or not client.is_connected:
+            return None
+
+        try:
+            await client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            client.close()
+        return None
+
+    async def deliver(
+        self,
+        client: Union[aiosmtplib.SMTP, None],
+        message: MessageSchema,
+    ) -> Union[aiosmtplib.SMTP, None]:
+        mime_message = build_mime_message(message, self.sender)
+        recipients = [*message.recipients, *message.cc, *message.bcc]
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                if client is None or not client.is_connected:
+                    client = await self.connect()
+                await client.send_message(mime_message, recipients=recipients)
+                self.sent += 1
+                return client
+            except (aiosmtplib.SMTPException, OSError):
+                client = await self.disconnect(client)
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.retry_backoff * 2**attempt)
+
+        return client
+
+    async def work(self):
+        client: Union[aiosmtplib.SMTP, None] = None
+        try:
+            while True:
+                try:
+                    batch = [await asyncio.wait_for(self.queue.get(), timeout=self.idle_timeout)]
+                except asyncio.TimeoutError:
+                    client = await self.disconnect(client)
+                    continue
+
+                while len(batch) < self.batch_size and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+
+                for message in batch:
+                    try:
+                        client = await self.deliver(client, message)
+                    except Exception as e:
+                        self.failed += 1
+                        print(f"Failed to send mail to {message.recipients}: {e}")
+                    finally:
+                        self.queue.task_done()
+        finally:
+            await self.disconnect(client)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
+
+
+@lru_cache()
+def get_mail_dispatcher() -> MailDispatcher:
+    return MailDispatcher(
+        config=config_smtp_server(),
+        workers=settings.MAIL_POOL_SIZE,
+        queue_size=settings.MAIL_QUEUE_SIZE,
+        batch_size=settings.MAIL_BATCH_SIZE,
+        max_retries=settings.MAIL_MAX_RETRIES,
+        retry_backoff=settings.MAIL_RETRY_BACKOFF,
+        idle_timeout=settings.MAIL_IDLE_TIMEOUT,
+    )
+
+
+def build_mail_body(context: Dict[str, Any], template_name: str) -> str:
+    return get_template_renderer().render(template_name, context)
+
+
+def prepare_message(
+    context: Dict[str, Any],
+    recipients: List[EmailStr],
+    subject: str,
+    template_name: str,
+) -> MessageSchema:
+    return MessageSchema(
+        subject=subject,
+        recipients=recipients,
+        body=build_mail_body(context, template_name),
+        subtype=MessageType.html,
+    )
+
+
+async def send_mail(
+    context: Dict[str, Any],
+    recipients: List[EmailStr],
+    subject: str,
+    template_name: str,
+) -> None:
+    message: MessageSchema = prepare_message(
+        context=context,
+        recipients=recipients,
+        subject=subject,
+        template_name=template_name,
+    )
+    await get_mail_dispatcher().enqueue(message)
@@ -30,6 +30,13 @@ def raise_404_not_found(message: str = "Not found") -> HTTPException:
     )
 
 
+def raise_409_conflict(message: str = "Conflict") -> HTTPException:
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"msg": message},
+    )
+
+
 def raise_410_gone(message: str = "Gone") -> HTTPException:
     raise HTTPException(
         status_code=status.HTTP_410_GONE,
@@ -37,8 +44,23 @@ def raise_410_gone(message: str = "Gone") -> HTTPException:
     )
 
 
+def raise_413_request_entity_too_large(message: str = "Request entity too large") -> HTTPException:
+    raise HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail={"msg": message},
+    )
+
+
 def raise_422_unprocessable_entity(message: str = "Unprocessable entity") -> HTTPException:
     raise HTTPException(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         detail={"msg": message},
     )
+
+
+def raise_429_too_many_requests(message: str = "Too many requests", retry_after: int = 1) -> HTTPException:
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={"msg": message},
+        headers={"Retry-After": str(retry_after)},
+    )
@@ -0,0 +1,72 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Tuple, Type, Union
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+FieldPlan = Tuple[Tuple[str, ModelField, Union[Type[BaseModel], None]], ...]
+
+
+def encode_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.dict(by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=encode_default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+@lru_cache(maxsize=None)
+def get_field_plan(schema: Type[BaseModel]) -> FieldPlan:
+    plan = []
+    for name, field in schema.__fields__.items():
+        if field.field_info.extra.get("hidden") is True:
+            continue
+
+        nested = None
+        if field.shape in (SHAPE_SINGLETON, SHAPE_LIST) and isinstance(field.type_, type):
+            nested = field.type_ if issubclass(field.type_, BaseModel) else None
+        plan.append((name, field, nested))
+    return tuple(plan)
+
+
+def dump_model(obj: Union[BaseModel, Mapping[str, Any]], schema: Type[BaseModel]) -> Dict[str, Any]:
+    if isinstance(obj, Mapping):
+        values = obj
+    else:
+        values = obj.__dict__
+
+    data = {}
+    for name, field, nested in get_field_plan(schema):
+        value = values[name] if name in values else field.get_default()
+        if nested is not None and value is not None:
+            if field.shape == SHAPE_LIST:
+                value = [dump_model(item, nested) for item in value]
+            else:
+                value = dump_model(value, nested)
+        data[field.alias] = value
+    return data
+
+
+def model_response(
+    content: Union[BaseModel, Mapping[str, Any], List[Union[BaseModel, Mapping[str, Any]]]],
+    schema: Type[BaseModel],
+    status_code: int = 200,
+    headers: Union[Dict[str, str], None] = None,
+) -> ORJSONResponse:
+    if isinstance(content, list):
+        data = [dump_model(item, schema) for item in content]
+    else:
+        data = dump_model(content, schema)
+    return ORJSONResponse(data, status_code=status_code, headers=headers)
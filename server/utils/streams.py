@@ -0,0 +1,25 @@
+from typing import AsyncIterator
+
+from server.utils.messages import raise_413_request_entity_too_large
+
+
+async def read_lines(chunks: AsyncIterator[bytes], max_line_size: int) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for chunk in chunks:
+        start = 0
+        end = chunk.find(b"\n")
+        while end >= 0:
+            if len(buffer) + end - start > max_line_size:
+                raise_413_request_entity_too_large(f"Line exceeds {max_line_size} bytes.")
+            buffer += chunk[start:end]
+            yield bytes(buffer)
+            buffer.clear()
+            start = end + 1
+            end = chunk.find(b"\n", start)
+
+        buffer += chunk[start:]
+        if len(buffer) > max_line_size:
+            raise_413_request_entity_too_large(f"Line exceeds {max_line_size} bytes.")
+
+    if buffer:
+        yield bytes(buffer)
@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Any, Dict, Tuple, Union
+
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound
+
+
+class MailTemplateRenderer:
+    def __init__(self, directory: str):
+        self.environment = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=True,
+            auto_reload=False,
+            cache_size=-1,
+        )
+        self.templates: Dict[Tuple[str, Union[str, None]], Template] = {}
+
+    def load(self) -> int:
+        for name in self.environment.list_templates(extensions=["html"]):
+            self.templates[(name, None)] = self.environment.get_template(name)
+        return len(self.templates)
+
+    def get_template(self, name: str, locale: Union[str, None] = None) -> Template:
+        template = self.templates.get((name, locale))
+        if template is not None:
+            return template
+
+        if locale is None:
+            template = self.environment.get_template(name)
+        else:
+            try:
+                template = self.environment.get_template(f"{locale}/{name}")
+            except TemplateNotFound:
+                template = self.get_template(name)
+
+        self.templates[(name, locale)] = template
+        return template
+
+    def render(self, name: str, context: Dict[str, Any], locale: Union[str, None] = None) -> str:
+        return self.get_template(name, locale).render(context)
+
+
+@lru_cache()
+def get_template_renderer() -> MailTemplateRenderer:
+    return MailTemplateRenderer(directory="server/templates")
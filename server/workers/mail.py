@@ -0,0 +1,106 @@
+import json
+from typing import Any, Dict, Union
+
+import aiosmtplib
+from jinja2 import TemplateError
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from server.config.factory import settings
+from server.database.managers import get_redis_client
+from server.utils.jobs import dead_letter_stream
+from server.utils.mailer import MailDispatcher, get_mail_dispatcher, prepare_message
+from server.utils.templates import get_template_renderer
+
+
+class MailWorker:
+    def __init__(self, consumer: str, batch_size: int = 10, block: int = 5000):
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.block = block
+        self.stream = settings.MAIL_JOB_STREAM
+        self.group = settings.MAIL_JOB_GROUP
+        self.dispatcher: MailDispatcher = get_mail_dispatcher()
+        self.smtp_client: Union[aiosmtplib.SMTP, None] = None
+
+    async def ensure_group(self):
+        client: Redis = get_redis_client()
+        try:
+            await client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def complete(self, message_id: bytes):
+        client: Redis = get_redis_client()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, message_id)
+            pipe.xdel(self.stream, message_id)
+            await pipe.execute()
+
+    async def bury(self, message_id: bytes, fields: Dict[bytes, Any]):
+        client: Redis = get_redis_client()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.xadd(dead_letter_stream(self.stream), fields)
+            pipe.xack(self.stream, self.group, message_id)
+            pipe.xdel(self.stream, message_id)
+            await pipe.execute()
+        print(f"Mail job {message_id.decode('utf-8')} moved to the dead-letter stream!")
+
+    async def handle(self, message_id: bytes, fields: Dict[bytes, Any]):
+        try:
+            payload = json.loads(fields[b"payload"])
+            message = prepare_message(**payload)
+            self.smtp_client = await self.dispatcher.deliver(self.smtp_client, message)
+        except (KeyError, TypeError, ValueError, TemplateError) as e:
+            print(f"Mail job {message_id.decode('utf-8')} is malformed: {e}")
+            await self.bury(message_id, fields)
+            return
+        except Exception as e:
+            print(f"Mail job {message_id.decode('utf-8')} failed and will be retried: {e}")
+            return
+
+        await self.complete(message_id)
+
+    async def reclaim(self):
+        client: Redis = get_redis_client()
+        response = await client.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            min_idle_time=settings.MAIL_JOB_VISIBILITY_TIMEOUT * 1000,
+            start_id="0-0",
+            count=self.batch_size,
+        )
+
+        for message_id, fields in response[1]:
+            if not fields:
+                continue
+
+            pending = await client.xpending_range(self.stream, self.group, min=message_id, max=message_id, count=1)
+            if pending and pending[0]["times_delivered"] > settings.MAIL_JOB_MAX_ATTEMPTS:
+                await self.bury(message_id, fields)
+            else:
+                await self.handle(message_id, fields)
+
+    async def run(self):
+        get_template_renderer().load()
+        await self.ensure_group()
+        client: Redis = get_redis_client()
+        print(f"Mail worker {self.consumer} consuming {self.stream} as part of {self.group}...")
+
+        try:
+            while True:
+                await self.reclaim()
+                response = await client.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {self.stream: ">"},
+                    count=self.batch_size,
+                    block=self.block,
+                )
+                for _, messages in response:
+                    for message_id, fields in messages:
+                        await self.handle(message_id, fields)
+        finally:
+            await self.dispatcher.disconnect(self.smtp_client)
@@ -0,0 +1,33 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from server.main import create_app
+from server.security.authentication import PasswordContext, pwd_context
+
+
+def test_password_context_offloads_hashing_and_verification():
+    context = PasswordContext()
+
+    async def run():
+        hashed_password = await context.hash_plain_password_async("Admin@12345")
+        results = await asyncio.gather(
+            context.verify_password_async("Admin@12345", hashed_password),
+            context.verify_password_async("Admin@1234", hashed_password),
+        )
+        return hashed_password, results
+
+    hashed_password, results = asyncio.run(run())
+    context.shutdown()
+
+    assert context.verify_password("Admin@12345", hashed_password)
+    assert results == [True, False]
+    assert context.stats()["queued"] == 0
+    assert context.stats()["running"] == 0
+
+
+def test_hashing_health_reports_pool_stats():
+    response = TestClient(create_app()).get("/health/hashing")
+
+    assert response.status_code == 200
+    assert response.json() == pwd_context.stats()
@@ -0,0 +1,154 @@
+import asyncio
+
+from bson import ObjectId
+
+from server.database.autocomplete import NameAutocomplete
+from server.utils.autocomplete import PrefixIndex, normalize_name
+
+
+def test_normalize_name_folds_case_accents_and_punctuation():
+    assert normalize_name("  Café -- Crème!  ") == "cafe creme"
+
+
+def test_suggest_matches_prefix_of_name_or_word():
+    index = PrefixIndex(max_entries=10, max_prefix_length=20, top_k=5)
+    index.add("1", "Red Cotton Shirt")
+    index.add("2", "Cotton Socks")
+    index.add("3", "Blue Jeans")
+
+    assert [key for key, _ in index.suggest("cot")] == ["2", "1"]
+    assert [key for key, _ in index.suggest("red c")] == ["1"]
+    assert index.suggest("shirt") == [("1", "Red Cotton Shirt")]
+    assert index.suggest("green") == []
+    assert index.suggest("") == []
+
+
+def test_suggest_orders_by_popularity_then_name():
+    index = PrefixIndex(max_entries=10, max_prefix_length=20, top_k=2)
+    index.add("1", "Shirt A")
+    index.add("2", "Shirt B")
+    index.add("3", "Shirt C")
+
+    assert [key for key, _ in index.suggest("sh")] == ["1", "2"]
+
+    index.hit("3", 2)
+    index.hit("2")
+    assert [key for key, _ in index.suggest("sh")] == ["3", "2"]
+    assert [key for key, _ in index.suggest("sh", limit=1)] == ["3"]
+
+
+def test_rename_and_remove_update_suggestions():
+    index = PrefixIndex(max_entries=10, max_prefix_length=20, top_k=2)
+    index.add("1", "Shirt A")
+    index.add("2", "Shirt B")
+    index.add("3", "Shirt C")
+    index.hit("1", 5)
+
+    index.add("1", "Scarf")
+    assert [key for key, _ in index.suggest("sh")] == ["2", "3"]
+    assert [key for key, _ in index.suggest("sc")] == ["1"]
+
+    index.remove("2")
+    index.remove("1")
+    assert [key for key, _ in index.suggest("s")] == ["3"]
+    assert len(index) == 1
+    assert index.stats()["nodes"] == len("shirt c") + len("c")
+
+
+def test_full_index_evicts_least_popular_entry():
+    index = PrefixIndex(max_entries=2, max_prefix_length=20, top_k=5)
+    index.add("1", "Shirt A")
+    index.add("2", "Shirt B")
+    index.hit("1")
+
+    index.add("3", "Shirt C")
+    assert "2" not in index
+    assert [key for key, _ in index.suggest("shirt")] == ["1", "3"]
+
+
+def test_prefixes_longer_than_indexed_length_are_filtered():
+    index = PrefixIndex(max_entries=10, max_prefix_length=4, top_k=5)
+    index.add("1", "Shirtwaist")
+    index.add("2", "Shirts")
+
+    assert [key for key, _ in index.suggest("shir")] == ["2", "1"]
+    assert [key for key, _ in index.suggest("shirtw")] == ["1"]
+
+
+class FakeCollection:
+    def __init__(self, documents, on_batch=None):
+        self.documents = documents
+        self.on_batch = on_batch
+
+    def find(self, query, projection, batch_size):
+        async def cursor():
+            for count, document in enumerate(self.documents, start=1):
+                yield document
+                if self.on_batch and count % batch_size == 0:
+                    self.on_batch()
+
+        return cursor()
+
+
+def make_autocomplete(collection: FakeCollection) -> NameAutocomplete:
+    document_model = type("FakeDocument", (), {"get_motor_collection": staticmethod(lambda: collection)})
+    return NameAutocomplete(document_model, interval=60, batch_size=2)
+
+
+def test_load_reconciles_names_and_keeps_popularity():
+    documents = [{"_id": ObjectId(), "name": f"Shirt {i}"} for i in range(3)]
+    autocomplete = make_autocomplete(FakeCollection(documents))
+    autocomplete.index.add("stale", "Shirt Stale")
+
+    asyncio.run(autocomplete.load())
+    autocomplete.hit(documents[2]["_id"])
+    documents[0]["name"] = "Scarf"
+    asyncio.run(autocomplete.load())
+
+    assert "stale" not in autocomplete.index
+    assert [name for _, name in autocomplete.suggest("shirt")] == ["Shirt 2", "Shirt 1"]
+    assert [name for _, name in autocomplete.suggest("scarf")] == ["Scarf"]
+
+
+def test_load_keeps_changes_made_while_it_runs():
+    created, deleted = ObjectId(), ObjectId()
+    documents = [{"_id": ObjectId(), "name": "Shirt A"}, {"_id": ObjectId(), "name": "Shirt B"}]
+    documents.append({"_id": deleted, "name": "Shirt C"})
+    autocomplete = make_autocomplete(FakeCollection(documents))
+
+    def write_during_load():
+        autocomplete.add(created, "Shirt New")
+        autocomplete.remove(deleted)
+
+    autocomplete.document_model.get_motor_collection().on_batch = write_during_load
+    asyncio.run(autocomplete.load())
+
+    assert str(created) in autocomplete.index
+    assert str(deleted) not in autocomplete.index
+    assert autocomplete.touched is None
+
+
+def test_refresh_survives_failed_load_and_stops_cleanly():
+    collection = FakeCollection([{"_id": ObjectId()}])
+    autocomplete = make_autocomplete(collection)
+    autocomplete.interval = 0
+    loads = []
+    find = collection.find
+
+    def counting_find(*args, **kwargs):
+        loads.append(args)
+        return find(*args, **kwargs)
+
+    collection.find = counting_find
+
+    async def run():
+        await autocomplete.start()
+        task = autocomplete.task
+        while len(loads) < 2:
+            await asyncio.sleep(0)
+        await autocomplete.stop()
+        return task
+
+    task = asyncio.run(run())
+    assert task.cancelled()
+    assert autocomplete.task is None
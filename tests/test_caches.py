@@ -0,0 +1,26 @@
+import time
+
+from server.utils.caches import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(cache) == 2
+
+
+def test_local_cache_expires_entries():
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.entries["a"] = (time.monotonic() - 1, "1")
+    assert cache.get("a") is None
+    assert "a" not in cache.entries
+
+    cache.set("b", "2", ttl=-1)
+    assert cache.get("b") is None
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from server.utils.cursors import (
+    decode_cursor,
+    decode_object_id_cursor,
+    decode_offset_cursor,
+    encode_cursor,
+    split_page,
+    split_page_by_offset,
+)
+
+
+def test_encode_decode_cursor():
+    cursor = encode_cursor(id="64a7f0c2e13b5a0d4c8b4567", name="Shop name")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == {"id": "64a7f0c2e13b5a0d4c8b4567", "name": "Shop name"}
+    assert str(decode_object_id_cursor(cursor)) == "64a7f0c2e13b5a0d4c8b4567"
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor(id="invalid"), encode_cursor(name="x")])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_object_id_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_split_page():
+    items = [SimpleNamespace(id=index) for index in range(3)]
+    assert split_page(items, 3, "id") == (items, None)
+
+    page, cursor = split_page(items, 2, "id")
+    assert page == items[:2]
+    assert decode_cursor(cursor) == {"id": 1}
+
+
+def test_split_page_by_offset():
+    items = list(range(3))
+    assert split_page_by_offset(items, 3, 0) == (items, None)
+
+    page, cursor = split_page_by_offset(items, 2, 4)
+    assert page == items[:2]
+    assert decode_offset_cursor(cursor) == 6
+
+
+@pytest.mark.parametrize("cursor", [encode_cursor(offset=-1), encode_cursor(offset="1"), encode_cursor(id=1)])
+def test_decode_invalid_offset_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_offset_cursor(cursor)
+    assert error.value.status_code == 400
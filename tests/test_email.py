@@ -0,0 +1,47 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi.testclient import TestClient
+
+from server.config.factory import settings
+from server.main import create_app
+from server.schemas.out.auth import TokenUser
+from server.security import onetime
+from server.utils import email
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture(autouse=True)
+def redis_server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(email, "get_redis_client", lambda: fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(onetime, "get_redis_client", lambda: fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(settings, "MAIL_JOBS_ENABLED", True)
+    return server
+
+
+def send_link(server, template: str, url: str) -> str:
+    user = TokenUser(id=1, username="mail-user", email="user@example.com")
+
+    async def run():
+        await email.send_activation_mail("Subject", template, url, user, {"new_email": "new@example.com"})
+        client = fakeredis.FakeAsyncRedis(server=server)
+        (_, fields), *_ = await client.xrange(settings.MAIL_JOB_STREAM)
+        return json.loads(fields[b"payload"])["context"]["url"]
+
+    link = urlsplit(asyncio.run(run()))
+    return f"{link.path}?{link.query}"
+
+
+@pytest.mark.parametrize(
+    "template, path",
+    [("password-reset", "/auth/password/reset"), ("change-email", "/auth/update/email")],
+)
+def test_mailed_link_is_accepted_by_route(redis_server, template, path):
+    link = send_link(redis_server, template, f"http://testserver{path}")
+
+    response = TestClient(create_app()).options(link)
+    assert response.status_code == 204
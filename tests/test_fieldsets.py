@@ -0,0 +1,69 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from server.main import create_app
+from server.models.documents.products import ProductDocument, ShopDocument
+from server.routes import products
+from server.schemas.common.products import ShopReference
+from server.schemas.out.products import ProductResponse
+from server.utils.fieldsets import extend_fieldset, narrow_model, parse_fieldset
+
+
+def test_parse_fieldset_accepts_names_and_aliases():
+    assert parse_fieldset(ProductResponse, None) is None
+    assert parse_fieldset(ProductResponse, "availableSizes, name,price") == ("name", "price", "available_sizes", "id")
+    assert parse_fieldset(ProductResponse, "available_sizes") == ("available_sizes", "id")
+
+
+def test_parse_fieldset_rejects_unknown_and_hidden_fields():
+    with pytest.raises(HTTPException) as error:
+        parse_fieldset(ProductResponse, "name,revision_id,secret")
+    assert error.value.status_code == 400
+    assert error.value.detail == {"msg": "Unknown fields: revision_id, secret"}
+
+
+def test_narrow_model_keeps_aliases_and_is_cached():
+    fields = parse_fieldset(ProductResponse, "availableSizes")
+    model = narrow_model(ProductResponse, fields)
+
+    assert narrow_model(ProductResponse, fields) is model
+    assert narrow_model(ProductResponse, None) is ProductResponse
+    assert [field.alias for field in model.__fields__.values()] == ["availableSizes", "_id"]
+
+
+def test_extend_fieldset_only_extends_sparse_fieldsets():
+    assert extend_fieldset(None, "name") is None
+    assert extend_fieldset(("id",), "name", "id") == ("id", "name")
+
+
+def test_include_shop_keeps_shop_details_in_sparse_fieldset(monkeypatch):
+    shop = ShopDocument.construct(id=ObjectId(), name="shop", address="address", owner_id=1)
+    shop_reference = ShopReference(id=shop.id, name=shop.name)
+    product = ProductDocument.construct(id=ObjectId(), name="product", price=9.99, shop=shop_reference)
+    projections = []
+
+    async def read_products(page, limit, cursor, fields):
+        projections.append(fields)
+        return [product], None
+
+    async def read_product_by_id(product_id, use_cache):
+        return product
+
+    async def attach_shop_details(products):
+        return [{**product.dict(), "shop_details": shop} for product in products]
+
+    monkeypatch.setattr(products, "read_products", read_products)
+    monkeypatch.setattr(products, "read_product_by_id", read_product_by_id)
+    monkeypatch.setattr(products, "attach_shop_details", attach_shop_details)
+    client = TestClient(create_app())
+    params = {"include_shop": True, "fields": "name,price"}
+
+    [listed] = client.get("/products", params=params).json()
+    single = client.get(f"/products/{product.id}", params=params).json()
+
+    assert projections == [("name", "price", "id", "shop")]
+    for body in (listed, single):
+        assert set(body) == {"_id", "name", "price", "shopDetails"}
+        assert body["shopDetails"]["name"] == "shop"
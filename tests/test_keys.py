@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwt
+
+from server.security.keys import KeyRing, is_asymmetric_algorithm
+
+
+def write_key(directory: Path, kid: str, algorithm: str, mtime: float, public_only: bool = False) -> Path:
+    if algorithm.startswith("ES"):
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    if public_only:
+        pem = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    else:
+        pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+
+    path = directory / f"{kid}.pem"
+    path.write_bytes(pem)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_is_asymmetric_algorithm():
+    assert is_asymmetric_algorithm("RS256")
+    assert is_asymmetric_algorithm("ES256")
+    assert not is_asymmetric_algorithm("HS256")
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256"])
+def test_key_ring_signs_with_newest_key_and_verifies_all(tmp_path, algorithm):
+    write_key(tmp_path, "b-old", algorithm, mtime=1000)
+    write_key(tmp_path, "a-new", algorithm, mtime=2000)
+    write_key(tmp_path, "retired", algorithm, mtime=3000, public_only=True)
+    ring = KeyRing(algorithm=algorithm, directory=str(tmp_path), active_kid=None)
+
+    kid, private_key = ring.signing_key()
+    assert kid == "a-new"
+
+    token = jwt.encode({"sub": "user"}, key=private_key, algorithm=algorithm, headers={"kid": kid})
+    assert jwt.get_unverified_header(token)["kid"] == "a-new"
+    assert jwt.decode(token, key=ring.verification_key(kid), algorithms=[algorithm]) == {"sub": "user"}
+
+    with pytest.raises(jwt.JWTError):
+        jwt.decode(token, key=ring.verification_key("b-old"), algorithms=[algorithm])
+
+
+def test_key_ring_prefers_configured_kid(tmp_path):
+    write_key(tmp_path, "old", "RS256", mtime=1000)
+    write_key(tmp_path, "new", "RS256", mtime=2000)
+
+    assert KeyRing(algorithm="RS256", directory=str(tmp_path), active_kid="old").signing_key()[0] == "old"
+    with pytest.raises(ValueError):
+        KeyRing(algorithm="RS256", directory=str(tmp_path), active_kid="missing").signing_key()
+
+
+def test_key_ring_rejects_unknown_kid_and_missing_private_key(tmp_path):
+    write_key(tmp_path, "public", "RS256", mtime=1000, public_only=True)
+    ring = KeyRing(algorithm="RS256", directory=str(tmp_path), active_kid=None)
+
+    with pytest.raises(ValueError):
+        ring.signing_key()
+    with pytest.raises(ValueError):
+        ring.verification_key("unknown")
+    with pytest.raises(ValueError):
+        ring.verification_key(None)
+
+
+def test_jwks_publishes_public_keys_only(tmp_path):
+    write_key(tmp_path, "rsa", "RS256", mtime=1000)
+    write_key(tmp_path, "retired", "RS256", mtime=2000, public_only=True)
+    ring = KeyRing(algorithm="RS256", directory=str(tmp_path), active_kid=None)
+
+    keys = ring.jwks()["keys"]
+    assert [key["kid"] for key in keys] == ["retired", "rsa"]
+    for key in keys:
+        assert key["kty"] == "RSA"
+        assert key["use"] == "sig"
+        assert key["alg"] == "RS256"
+        assert {"n", "e"} <= set(key)
+        assert "d" not in key
@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import aiosmtplib
+import pytest
+
+from server.config.factory import settings
+from server.utils.jobs import dead_letter_stream
+from server.workers import mail
+from server.workers.mail import MailWorker
+
+fakeredis = pytest.importorskip("fakeredis")
+
+JOB = {
+    "context": {"username": "user", "url": "http://localhost/auth/activate?validation_key=key"},
+    "recipients": ["user@example.com"],
+    "subject": "Account activation",
+    "template_name": "activation.html",
+}
+
+
+@pytest.fixture(autouse=True)
+def redis_client(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(mail, "get_redis_client", lambda: client)
+    monkeypatch.setattr(settings, "MAIL_JOB_VISIBILITY_TIMEOUT", 0)
+    monkeypatch.setattr(settings, "MAIL_JOB_MAX_ATTEMPTS", 2)
+    return client
+
+
+def make_worker(consumer: str, sent: list, failures: int = 0) -> MailWorker:
+    worker = MailWorker(consumer=consumer)
+    attempts = iter(range(failures + 1000))
+
+    async def deliver(client, message):
+        if next(attempts) < failures:
+            raise aiosmtplib.SMTPServerDisconnected("connection lost")
+        sent.append(message.recipients)
+        return client
+
+    worker.dispatcher.deliver = deliver
+    return worker
+
+
+async def read_new(redis_client, worker: MailWorker):
+    response = await redis_client.xreadgroup(worker.group, worker.consumer, {worker.stream: ">"}, count=10)
+    return [message for _, messages in response for message in messages]
+
+
+async def pending_count(redis_client) -> int:
+    return (await redis_client.xpending(settings.MAIL_JOB_STREAM, settings.MAIL_JOB_GROUP))["pending"]
+
+
+def test_delivered_job_is_acknowledged_and_removed(redis_client):
+    async def run():
+        sent = []
+        worker = make_worker("mailer-1", sent)
+        await worker.ensure_group()
+        await worker.ensure_group()
+        await redis_client.xadd(worker.stream, {"payload": json.dumps(JOB)})
+
+        for message_id, fields in await read_new(redis_client, worker):
+            await worker.handle(message_id, fields)
+
+        assert sent == [["user@example.com"]]
+        assert await pending_count(redis_client) == 0
+        assert await redis_client.xlen(worker.stream) == 0
+
+    asyncio.run(run())
+
+
+def test_failed_job_stays_pending_and_is_reclaimed_by_another_consumer(redis_client):
+    async def run():
+        sent = []
+        crashed = make_worker("mailer-1", sent, failures=1)
+        await crashed.ensure_group()
+        await redis_client.xadd(crashed.stream, {"payload": json.dumps(JOB)})
+
+        for message_id, fields in await read_new(redis_client, crashed):
+            await crashed.handle(message_id, fields)
+        assert sent == []
+        assert await pending_count(redis_client) == 1
+
+        await make_worker("mailer-2", sent).reclaim()
+
+        assert sent == [["user@example.com"]]
+        assert await pending_count(redis_client) == 0
+        assert await redis_client.xlen(crashed.stream) == 0
+
+    asyncio.run(run())
+
+
+def test_job_exceeding_max_attempts_is_dead_lettered(redis_client):
+    async def run():
+        sent = []
+        worker = make_worker("mailer-1", sent, failures=100)
+        await worker.ensure_group()
+        await redis_client.xadd(worker.stream, {"payload": json.dumps(JOB)})
+
+        for message_id, fields in await read_new(redis_client, worker):
+            await worker.handle(message_id, fields)
+        await worker.reclaim()
+        assert await pending_count(redis_client) == 1
+
+        await worker.reclaim()
+
+        assert sent == []
+        assert await pending_count(redis_client) == 0
+        assert await redis_client.xlen(worker.stream) == 0
+        dead = await redis_client.xrange(dead_letter_stream(worker.stream))
+        assert [json.loads(fields[b"payload"]) for _, fields in dead] == [JOB]
+
+    asyncio.run(run())
+
+
+def test_malformed_job_is_dead_lettered_immediately(redis_client):
+    async def run():
+        worker = make_worker("mailer-1", [])
+        await worker.ensure_group()
+        await redis_client.xadd(worker.stream, {"payload": "not json"})
+
+        for message_id, fields in await read_new(redis_client, worker):
+            await worker.handle(message_id, fields)
+
+        assert await pending_count(redis_client) == 0
+        assert await redis_client.xlen(dead_letter_stream(worker.stream)) == 1
+
+    asyncio.run(run())
@@ -0,0 +1,118 @@
+import asyncio
+from typing import List
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig, MessageSchema, MessageType
+
+from server.utils.mailer import MailDispatcher, build_mime_message
+
+
+class FakeSMTP:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.is_connected = True
+        self.sent: List[str] = []
+
+    async def send_message(self, message, recipients):
+        if self.failures:
+            self.failures -= 1
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("connection lost")
+        self.sent.append(message["To"])
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+def make_dispatcher(clients: List[FakeSMTP], batch_size: int = 10, max_retries: int = 1) -> MailDispatcher:
+    config = ConnectionConfig(
+        MAIL_USERNAME="user",
+        MAIL_PASSWORD="password",
+        MAIL_FROM="noreply@example.com",
+        MAIL_FROM_NAME="Shop",
+        MAIL_PORT=25,
+        MAIL_SERVER="localhost",
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+    )
+    dispatcher = MailDispatcher(
+        config=config,
+        workers=1,
+        queue_size=100,
+        batch_size=batch_size,
+        max_retries=max_retries,
+        retry_backoff=0,
+        idle_timeout=60,
+    )
+    connections = iter(clients)
+
+    async def connect():
+        return next(connections)
+
+    dispatcher.connect = connect
+    return dispatcher
+
+
+def make_message(recipient: str) -> MessageSchema:
+    return MessageSchema(subject="Hello", recipients=[recipient], body="<p>Hi</p>", subtype=MessageType.html)
+
+
+def dispatch(dispatcher: MailDispatcher, messages: List[MessageSchema]):
+    async def run():
+        await dispatcher.start()
+        for message in messages:
+            await dispatcher.enqueue(message)
+        await dispatcher.stop(timeout=5)
+
+    asyncio.run(run())
+
+
+def test_build_mime_message_sets_headers_and_html_body():
+    message = MessageSchema(
+        subject="Hello",
+        recipients=["a@example.com", "b@example.com"],
+        cc=["c@example.com"],
+        body="<p>Hi</p>",
+        subtype=MessageType.html,
+    )
+    mime_message = build_mime_message(message, "Shop <noreply@example.com>")
+
+    assert mime_message["Subject"] == "Hello"
+    assert mime_message["From"] == "Shop <noreply@example.com>"
+    assert mime_message["To"] == "a@example.com, b@example.com"
+    assert mime_message["Cc"] == "c@example.com"
+    assert mime_message.get_content_type() == "text/html"
+    assert mime_message.get_content().strip() == "<p>Hi</p>"
+
+
+def test_batch_is_sent_over_one_connection():
+    client = FakeSMTP()
+    dispatcher = make_dispatcher([client])
+
+    dispatch(dispatcher, [make_message(f"user{i}@example.com") for i in range(5)])
+
+    assert client.sent == [f"user{i}@example.com" for i in range(5)]
+    assert dispatcher.stats() == {"queued": 0, "sent": 5, "failed": 0}
+
+
+def test_dropped_connection_is_reopened_and_message_retried():
+    broken, fresh = FakeSMTP(failures=1), FakeSMTP()
+    dispatcher = make_dispatcher([broken, fresh])
+
+    dispatch(dispatcher, [make_message("a@example.com"), make_message("b@example.com")])
+
+    assert broken.sent == []
+    assert fresh.sent == ["a@example.com", "b@example.com"]
+    assert dispatcher.stats()["sent"] == 2
+
+
+def test_failed_messages_are_counted_and_worker_keeps_running():
+    dispatcher = make_dispatcher([FakeSMTP(failures=1), FakeSMTP(failures=1), FakeSMTP()], max_retries=1)
+    invalid = MessageSchema.construct(subject="Broken", recipients=None, body="", subtype=MessageType.html)
+
+    dispatch(dispatcher, [make_message("a@example.com"), invalid, make_message("b@example.com")])
+
+    assert dispatcher.stats() == {"queued": 0, "sent": 1, "failed": 2}
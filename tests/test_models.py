@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import orjson
+from bson import ObjectId
+
+from server.models.base import construct_model, trusted_projection
+from server.models.documents.products import ProductDocument
+from server.schemas.common.products import ShopReference
+
+
+def test_construct_model_builds_nested_models_from_raw_documents():
+    product_id, shop_id = ObjectId(), ObjectId()
+    product = construct_model(
+        ProductDocument,
+        {
+            "_id": product_id,
+            "name": "product",
+            "brand": "brand",
+            "model": "model",
+            "description": "description",
+            "price": 9.99,
+            "created_at": datetime(2023, 2, 5),
+            "shop": {"id": shop_id, "name": "shop"},
+        },
+    )
+
+    assert product.id == product_id
+    assert isinstance(product.shop, ShopReference)
+    assert product.shop.id == shop_id
+    assert product.version == 0
+    assert product.colors == []
+
+
+def test_trusted_projection_skips_hidden_fields():
+    projection = trusted_projection(ProductDocument)
+    assert projection["_id"] == 1
+    assert projection["shop"] == 1
+    assert "revision_id" not in projection
+
+
+def test_construct_model_restores_types_from_cached_json():
+    product_id, shop_id = ObjectId(), ObjectId()
+    cached = ProductDocument.construct(
+        id=product_id,
+        name="product",
+        brand="brand",
+        model="model",
+        description="description",
+        price=9.99,
+        created_at=datetime(2023, 2, 5, 10, 30),
+        shop=ShopReference(id=shop_id, name="shop"),
+    ).json()
+
+    product = construct_model(ProductDocument, orjson.loads(cached))
+
+    assert product.id == product_id
+    assert product.shop.id == shop_id
+    assert isinstance(product.shop.id, ObjectId)
+    assert product.created_at.replace(tzinfo=None) == datetime(2023, 2, 5, 10, 30)
+    assert product.last_updated_at is None
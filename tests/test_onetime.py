@@ -0,0 +1,25 @@
+import time
+
+from server.security.onetime import (
+    one_time_token_key,
+    parse_one_time_token,
+    sign_one_time_token,
+)
+
+
+def make_token(purpose: str, nonce: str, expires_at: int) -> str:
+    expires_at = format(expires_at, "x")
+    return f"{nonce}.{expires_at}.{sign_one_time_token(purpose, nonce, expires_at)}"
+
+
+def test_parse_accepts_signed_token():
+    token = make_token("activation", "abc", int(time.time()) + 60)
+    assert parse_one_time_token(token, "activation") == one_time_token_key("activation", "abc")
+
+
+def test_parse_rejects_tampered_expired_or_foreign_tokens():
+    token = make_token("activation", "abc", int(time.time()) + 60)
+    assert parse_one_time_token(token, "password-reset") is None
+    assert parse_one_time_token(token.replace("abc", "abd"), "activation") is None
+    assert parse_one_time_token(make_token("activation", "abc", int(time.time()) - 1), "activation") is None
+    assert parse_one_time_token("not-a-token", "activation") is None
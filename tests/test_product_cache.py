@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from server.database.products import crud
+from server.models.documents.products import ProductDocument, ShopDocument
+from server.schemas.common.products import ShopReference
+
+
+def test_cached_product_resolves_shop_details(monkeypatch):
+    shop = ShopDocument.construct(id=ObjectId(), name="shop", address="address", owner_id=1)
+    product = ProductDocument.construct(
+        id=ObjectId(),
+        name="product",
+        brand="brand",
+        model="model",
+        description="description",
+        price=9.99,
+        created_at=datetime(2023, 2, 5),
+        shop=ShopReference(id=shop.id, name=shop.name),
+    )
+
+    async def cached(key):
+        return product.json()
+
+    async def read_shops_by_ids(shop_ids):
+        return {shop.id: shop for shop_id in shop_ids if shop_id == shop.id}
+
+    monkeypatch.setattr(crud.product_cache, "get", cached)
+    monkeypatch.setattr(crud, "read_shops_by_ids", read_shops_by_ids)
+
+    async def run():
+        cached_product = await crud.read_product_by_id(str(product.id))
+        return await crud.attach_shop_details([cached_product])
+
+    [result] = asyncio.run(run())
+    assert result["shop_details"] is shop
+    assert result["shop"]["id"] == shop.id
+
+
+def test_product_cache_key_is_canonical_object_id(monkeypatch):
+    product_id = ObjectId()
+    keys = []
+
+    async def cached(key):
+        keys.append(key)
+        return ProductDocument.construct(id=product_id, name="product").json()
+
+    monkeypatch.setattr(crud.product_cache, "get", cached)
+
+    asyncio.run(crud.read_product_by_id(str(product_id).upper()))
+    assert keys == [str(product_id)]
+
+
+def test_invalid_product_id_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(crud.read_product_by_id("not-an-id"))
+    assert error.value.status_code == 400
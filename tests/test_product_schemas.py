@@ -0,0 +1,46 @@
+import pytest
+from pydantic import ValidationError
+
+from server.schemas.inc.products import (
+    ProductBulkUpdateRequest,
+    ProductUpdateRequest,
+    ShopUpdateRequest,
+)
+
+
+@pytest.mark.parametrize("field", ["name", "brand", "model", "description", "price"])
+def test_product_update_rejects_null_required_fields(field):
+    with pytest.raises(ValidationError):
+        ProductUpdateRequest(**{field: None})
+
+
+def test_product_update_keeps_only_sent_fields():
+    assert ProductUpdateRequest(price=10).dict(exclude_unset=True) == {"price": 10}
+    assert ProductUpdateRequest(rating=None).dict(exclude_unset=True) == {"rating": None}
+
+
+@pytest.mark.parametrize("field", ["name", "address"])
+def test_shop_update_rejects_null_required_fields(field):
+    with pytest.raises(ValidationError):
+        ShopUpdateRequest(**{field: None})
+
+
+def test_shop_update_allows_clearing_optional_fields():
+    assert ShopUpdateRequest(emails=None).dict(exclude_unset=True) == {"emails": None}
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"items": [{"id": "5f9d7a9b9b3f4c1e9c3e8e3e", "changes": {"price": None}}]},
+        {"shop_ids": ["5f9d7a9b9b3f4c1e9c3e8e3e"], "changes": {"name": None}},
+    ],
+)
+def test_bulk_update_rejects_null_required_fields(payload):
+    with pytest.raises(ValidationError):
+        ProductBulkUpdateRequest(**payload)
+
+
+def test_bulk_update_sets_only_sent_fields():
+    request = ProductBulkUpdateRequest(shop_ids=["5f9d7a9b9b3f4c1e9c3e8e3e"], changes={"price": 5})
+    assert request.changes.dict(exclude_unset=True) == {"price": 5}
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+from bson import ObjectId
+from pymongo import ASCENDING, MongoClient
+from pymongo.errors import PyMongoError
+
+from server.config.factory import settings
+from server.database.products.crud import (
+    build_product_search_filter,
+    build_product_search_pipeline,
+)
+from server.models.documents.products import ProductDocument
+from server.schemas.inc.products import ProductSearchQuery
+
+SEARCH_QUERIES = [
+    ProductSearchQuery(),
+    ProductSearchQuery(text="shirt"),
+    ProductSearchQuery(text="shirt", brands=["brand-1"], max_price=50),
+    ProductSearchQuery(min_price=10, max_price=50),
+    ProductSearchQuery(brands=["brand-1", "brand-2"], min_price=10),
+    ProductSearchQuery(colors=["red"], max_price=50),
+    ProductSearchQuery(sizes=["M", "L"]),
+    ProductSearchQuery(min_rating=4),
+]
+
+
+@pytest.fixture(scope="module")
+def collection():
+    client = MongoClient(settings.MONGO_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("MongoDB is not reachable")
+
+    database = client[f"test_product_search_{ObjectId()}"]
+    collection = database[ProductDocument.Settings.name]
+    for index in ProductDocument.Settings.indexes:
+        collection.create_index([(index, ASCENDING)] if isinstance(index, str) else index)
+    collection.insert_many(
+        {
+            "name": f"shirt {i}" if i % 2 else f"shoe {i}",
+            "brand": f"brand-{i % 5}",
+            "price": float(i),
+            "colors": ["red", "blue"] if i % 3 else ["green"],
+            "available_sizes": ["S", "M", "L"][: 1 + i % 3],
+            "rating": float(i % 6),
+            "shop": {"id": ObjectId(), "name": "shop"},
+        }
+        for i in range(500)
+    )
+
+    yield collection
+    client.drop_database(database.name)
+    client.close()
+
+
+def test_search_filter_combines_all_predicates():
+    query = ProductSearchQuery(
+        text="shirt",
+        min_price=10,
+        max_price=20,
+        brands=["a"],
+        colors=["red"],
+        sizes=["M"],
+        min_rating=3,
+    )
+
+    assert build_product_search_filter(query) == {
+        "$text": {"$search": "shirt"},
+        "brand": {"$in": ["a"]},
+        "colors": {"$in": ["red"]},
+        "available_sizes": {"$in": ["M"]},
+        "price": {"$gte": 10, "$lte": 20},
+        "rating": {"$gte": 3},
+    }
+    assert build_product_search_filter(ProductSearchQuery()) == {}
+
+
+def test_search_query_rejects_inverted_price_range():
+    with pytest.raises(ValueError):
+        ProductSearchQuery(min_price=20, max_price=10)
+
+
+def test_search_pipeline_computes_facets_in_a_single_stage():
+    pipeline = build_product_search_pipeline(ProductSearchQuery(brands=["a"]), offset=20, limit=10)
+
+    assert [next(iter(stage)) for stage in pipeline] == ["$match", "$sort", "$facet"]
+    assert set(pipeline[2]["$facet"]) == {"items", "brands", "colors", "sizes", "prices", "total"}
+    assert pipeline[2]["$facet"]["items"][:2] == [{"$skip": 20}, {"$limit": 11}]
+
+
+@pytest.mark.parametrize("query", SEARCH_QUERIES)
+def test_search_does_not_scan_collection(collection, query):
+    pipeline = build_product_search_pipeline(query, offset=0, limit=10)
+    explain = collection.database.command(
+        "aggregate",
+        collection.name,
+        pipeline=pipeline,
+        explain=True,
+    )
+
+    assert "COLLSCAN" not in json.dumps(explain, default=str)
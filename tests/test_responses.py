@@ -0,0 +1,46 @@
+import json
+from datetime import datetime
+from typing import List, Union
+
+from bson import ObjectId
+
+from server.schemas.base import BaseAPISchema
+from server.utils.responses import model_response
+
+
+class ReferenceSchema(BaseAPISchema):
+    id: str
+    display_name: str
+
+
+class ItemSchema(BaseAPISchema):
+    item_name: str
+    created_at: datetime
+    tags: List[str] = []
+    reference: Union[ReferenceSchema, None] = None
+
+
+def test_model_response_matches_pydantic_json():
+    item = ItemSchema(
+        item_name="item",
+        created_at=datetime(2023, 2, 5, 11, 44, 39, 272446),
+        reference=ReferenceSchema(id="1", display_name="ref"),
+    )
+
+    response = model_response([item, {"item_name": "raw", "created_at": datetime(2023, 2, 5)}], ItemSchema)
+    assert json.loads(response.body) == [
+        json.loads(item.json(by_alias=True)),
+        {"itemName": "raw", "createdAt": "2023-02-05T00:00:00Z", "tags": [], "reference": None},
+    ]
+
+
+def test_model_response_encodes_object_ids_and_headers():
+    object_id = ObjectId()
+    response = model_response(
+        {"id": object_id, "display_name": "ref"},
+        ReferenceSchema,
+        headers={"X-Next-Cursor": "abc"},
+    )
+
+    assert json.loads(response.body) == {"id": str(object_id), "displayName": "ref"}
+    assert response.headers["X-Next-Cursor"] == "abc"
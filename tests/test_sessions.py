@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from server.config.factory import settings
+from server.security import revocation, sessions
+from server.security.revocation import session_denylist
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture(autouse=True)
+def redis_client(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(sessions, "get_redis_client", lambda: client)
+    monkeypatch.setattr(revocation, "get_redis_client", lambda: client)
+    monkeypatch.setattr(session_denylist, "sessions", set())
+    return client
+
+
+async def is_rejected(token: str) -> bool:
+    try:
+        await sessions.rotate_refresh_token(token)
+    except HTTPException as e:
+        return e.status_code == 401
+    return False
+
+
+def test_rotation_keeps_session_and_rejects_reuse():
+    async def run():
+        token, family = await sessions.issue_refresh_token(1)
+
+        user_id, rotated_family, new_token = await sessions.rotate_refresh_token(token)
+        assert (user_id, rotated_family) == (1, family)
+
+        assert await is_rejected(token)
+        assert await is_rejected(new_token)
+
+    asyncio.run(run())
+
+
+def test_revoked_session_cannot_refresh():
+    async def run():
+        token, family = await sessions.issue_refresh_token(1)
+        other_token, _ = await sessions.issue_refresh_token(1)
+
+        await sessions.revoke_sessions(1, family)
+
+        assert await is_rejected(token)
+        assert (await sessions.rotate_refresh_token(other_token))[0] == 1
+        assert session_denylist.is_revoked(family) is settings.JWT_LOCAL_VERIFICATION
+
+    asyncio.run(run())
+
+
+def test_revoking_user_sessions_invalidates_every_family():
+    async def run():
+        tokens = [await sessions.issue_refresh_token(1) for _ in range(2)]
+        foreign_token, _ = await sessions.issue_refresh_token(2)
+
+        revoked = await sessions.revoke_user_sessions(1)
+
+        assert sorted(revoked) == sorted(family for _, family in tokens)
+        for token, _ in tokens:
+            assert await is_rejected(token)
+        assert (await sessions.rotate_refresh_token(foreign_token))[0] == 2
+
+    asyncio.run(run())
+
+
+def test_reuse_revokes_family_session(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_LOCAL_VERIFICATION", True)
+
+    async def run():
+        token, family = await sessions.issue_refresh_token(1)
+        await sessions.rotate_refresh_token(token)
+
+        assert await is_rejected(token)
+        assert session_denylist.is_revoked(family)
+        assert family not in await sessions.revoke_user_sessions(1)
+
+    asyncio.run(run())
+
+
+def test_concurrent_rotations_of_one_token_succeed_once():
+    async def run():
+        token, _ = await sessions.issue_refresh_token(1)
+
+        results = await asyncio.gather(*[is_rejected(token) for _ in range(5)])
+        assert sorted(results) == [False] + [True] * 4
+
+    asyncio.run(run())
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from server.utils.streams import read_lines
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def collect(*chunks: bytes, max_line_size: int = 1024):
+    async def run():
+        return [line async for line in read_lines(stream(*chunks), max_line_size)]
+
+    return asyncio.run(run())
+
+
+def test_read_lines_across_chunks():
+    assert collect(b'{"a": 1}\n{"b"', b": 2}\n", b'{"c": 3}') == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+def test_read_lines_keeps_blank_lines():
+    assert collect(b"a\n\nb\n") == [b"a", b"", b"b"]
+    assert collect() == []
+
+
+def test_read_lines_allows_lines_up_to_the_limit():
+    assert collect(b"ab", b"cd\nef", max_line_size=4) == [b"abcd", b"ef"]
+
+
+@pytest.mark.parametrize("chunks", [(b"abcde\n",), (b"ab", b"cde"), (b"abc", b"de\nf")])
+def test_read_lines_rejects_long_lines(chunks):
+    with pytest.raises(HTTPException) as e:
+        collect(*chunks, max_line_size=4)
+    assert e.value.status_code == 413
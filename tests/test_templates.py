@@ -0,0 +1,22 @@
+from server.utils.templates import MailTemplateRenderer
+
+
+def test_renderer_compiles_templates_once(tmp_path):
+    (tmp_path / "greeting.html").write_text("<p>Hi {{ username }}</p>")
+    renderer = MailTemplateRenderer(directory=str(tmp_path))
+    assert renderer.load() == 1
+
+    template = renderer.get_template("greeting.html")
+    assert renderer.get_template("greeting.html") is template
+    assert renderer.render("greeting.html", {"username": "<admin>"}) == "<p>Hi &lt;admin&gt;</p>"
+
+
+def test_renderer_falls_back_to_default_locale(tmp_path):
+    (tmp_path / "bn").mkdir()
+    (tmp_path / "greeting.html").write_text("Hi {{ username }}")
+    (tmp_path / "bn" / "greeting.html").write_text("Nomoskar {{ username }}")
+    renderer = MailTemplateRenderer(directory=str(tmp_path))
+
+    assert renderer.render("greeting.html", {"username": "a"}, locale="bn") == "Nomoskar a"
+    assert renderer.render("greeting.html", {"username": "a"}, locale="fr") == "Hi a"
+    assert renderer.get_template("greeting.html", "fr") is renderer.get_template("greeting.html")
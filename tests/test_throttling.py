@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from server.security import throttling
+from server.security.throttling import RateLimiter
+
+
+def test_local_limiter_rejects_after_limit_across_identities():
+    limiter = RateLimiter("test", limit=2, window=60)
+    keys = [limiter.cache_key("ip:1"), limiter.cache_key("username:a")]
+
+    assert limiter.hit_local(keys, now=0) == 0
+    assert limiter.hit_local(keys, now=1000) == 0
+    assert limiter.hit_local(keys, now=2000) == 58000
+    assert limiter.hit_local([limiter.cache_key("username:a")], now=2000) == 58000
+    assert limiter.hit_local([limiter.cache_key("ip:2")], now=2000) == 0
+
+
+def test_local_limiter_slides_window():
+    limiter = RateLimiter("test", limit=1, window=60)
+    keys = [limiter.cache_key("ip:1")]
+
+    assert limiter.hit_local(keys, now=0) == 0
+    assert limiter.hit_local(keys, now=30000) == 30000
+    assert limiter.hit_local(keys, now=60001) == 0
+
+
+def test_redis_limiter_uses_current_client(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    limiter = RateLimiter("test", limit=1, window=60)
+    keys = [limiter.cache_key("ip:1")]
+
+    async def run():
+        first_client, second_client = fakeredis.FakeAsyncRedis(), fakeredis.FakeAsyncRedis()
+        monkeypatch.setattr(throttling, "get_redis_client", lambda: first_client)
+        assert await limiter.hit_redis(keys, now=0) == 0
+        await first_client.close()
+
+        monkeypatch.setattr(throttling, "get_redis_client", lambda: second_client)
+        assert await limiter.hit_redis(keys, now=1000) == 0
+        assert await second_client.zcard(keys[0]) == 1
+
+    asyncio.run(run())
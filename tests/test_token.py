@@ -0,0 +1,26 @@
+import pytest
+
+from server.models.schemas.users import UserAccount
+from server.security.token import (
+    claims_cache,
+    create_jwt,
+    decode_jwt,
+    decode_jwt_claims,
+)
+
+
+def test_jwt_claims_are_verified_locally_and_cached():
+    user = UserAccount(id=1, username="username", email="user@example.com", hashed_password="hash", is_active=True)
+    token = create_jwt(user)
+
+    claims = decode_jwt_claims(token)
+    assert claims.is_active
+    assert claims.sid
+    assert decode_jwt_claims(token) is claims
+    assert decode_jwt(token).username == "username"
+    assert len(claims_cache) >= 1
+
+
+def test_invalid_jwt_is_rejected():
+    with pytest.raises(ValueError):
+        decode_jwt_claims("invalid.token.value")